@@ -0,0 +1,62 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 이 일수보다 오래된 게시글을 보관 테이블로 이동 (0이면 비활성)
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "0"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+
+def archive_old_posts(supabase, older_than_days: int, batch_size: int) -> int:
+    """오래된 게시글을 배치 단위로 모두 옮기고 이동한 건수 반환"""
+    total = 0
+    while True:
+        response = supabase.rpc(
+            "archive_old_posts",
+            {"older_than_days": older_than_days, "batch_size": batch_size},
+        ).execute()
+        moved = response.data or 0
+        total += moved
+        if moved < batch_size:
+            return total
+
+
+class ArchiveJob:
+    """주기적으로 archive_old_posts를 실행하는 백그라운드 작업"""
+
+    def __init__(
+        self, get_client, older_than_days: int, batch_size: int, interval: float
+    ):
+        self._get_client = get_client
+        self.older_than_days = older_than_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> int:
+        moved = archive_old_posts(
+            self._get_client(), self.older_than_days, self.batch_size
+        )
+        if moved:
+            logger.info("Archived %d posts older than %d days", moved, self.older_than_days)
+        return moved
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.warning("Archive job failed: %s", e)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="archive-job", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
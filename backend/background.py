@@ -0,0 +1,154 @@
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_QUEUE_SIZE = int(os.getenv("BACKGROUND_QUEUE_SIZE", "10000"))
+BACKGROUND_BATCH_SIZE = int(os.getenv("BACKGROUND_BATCH_SIZE", "500"))
+# 첫 작업이 들어온 뒤 배치를 모으는 시간(초)
+BACKGROUND_FLUSH_INTERVAL = float(os.getenv("BACKGROUND_FLUSH_INTERVAL", "0.2"))
+# 종료 시 남은 작업을 처리하며 기다리는 최대 시간(초)
+BACKGROUND_DRAIN_TIMEOUT = float(os.getenv("BACKGROUND_DRAIN_TIMEOUT", "10"))
+
+
+class BackgroundQueue:
+    """응답 후에 해도 되는 쓰기를 모아 종류별로 배치 실행 (큐가 차면 버리고 기록)"""
+
+    def __init__(
+        self,
+        maxsize: int = BACKGROUND_QUEUE_SIZE,
+        batch_size: int = BACKGROUND_BATCH_SIZE,
+        flush_interval: float = BACKGROUND_FLUSH_INTERVAL,
+    ):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[tuple[str, Any]] = queue.Queue(maxsize=maxsize)
+        self._handlers: dict[str, Callable[[list], object]] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_depth = 0
+
+    def register(self, kind: str, handler: Callable[[list], object]) -> None:
+        """kind 작업을 모아서 handler(items)로 처리"""
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, item: Any) -> bool:
+        """작업 추가 (큐가 가득 찼거나 종료 중이면 False)"""
+        if kind not in self._handlers:
+            raise KeyError(f"No handler registered for {kind}")
+        if self._stopping.is_set():
+            with self._lock:
+                self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait((kind, item))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def _next_batch(self, wait: bool) -> list[tuple[str, Any]]:
+        try:
+            if wait:
+                first = self._queue.get(timeout=self.flush_interval)
+            else:
+                first = self._queue.get_nowait()
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + (self.flush_interval if wait else 0)
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _process(self, batch: list[tuple[str, Any]]) -> None:
+        grouped: dict[str, list] = {}
+        for kind, item in batch:
+            grouped.setdefault(kind, []).append(item)
+        for kind, items in grouped.items():
+            try:
+                self._handlers[kind](items)
+            except Exception as e:
+                logger.warning("Background %s batch of %d failed: %s", kind, len(items), e)
+                with self._lock:
+                    self.failed += len(items)
+            else:
+                with self._lock:
+                    self.processed += len(items)
+            with self._lock:
+                self.batches += 1
+
+    def flush(self) -> None:
+        """큐에 남은 작업을 호출한 스레드에서 모두 처리"""
+        while batch := self._next_batch(wait=False):
+            self._process(batch)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._next_batch(wait=True)
+            if batch:
+                self._process(batch)
+        self.flush()
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="background-queue", daemon=True
+        )
+        self._thread.start()
+
+    def drain(self, timeout: float = BACKGROUND_DRAIN_TIMEOUT) -> int:
+        """새 작업을 받지 않고 남은 작업을 처리한 뒤 처리하지 못한 개수 반환"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        else:
+            self.flush()
+        remaining = self._queue.qsize()
+        if remaining:
+            logger.warning("Background queue stopped with %d pending items", remaining)
+        return remaining
+
+    def clear(self) -> None:
+        """처리하지 않고 남은 작업 버림"""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "capacity": self.maxsize,
+                "max_depth": self.max_depth,
+                "submitted": self.submitted,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
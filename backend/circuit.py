@@ -0,0 +1,118 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# 최근 CIRCUIT_WINDOW번의 호출 중 실패/느린 호출 비율이 CIRCUIT_FAILURE_RATE 이상이면 차단
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "20"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "10"))
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+# 이 시간(ms)보다 오래 걸린 호출은 실패로 간주
+CIRCUIT_SLOW_CALL_MS = float(os.getenv("CIRCUIT_SLOW_CALL_MS", "2000"))
+# 차단 후 시험 호출을 허용하기까지의 시간(초)
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "10"))
+
+# 차단 중 읽기 API가 대신 반환할 마지막 성공 결과 보관 수/기간(초)
+STALE_CACHE_SIZE = int(os.getenv("STALE_CACHE_SIZE", "2000"))
+STALE_MAX_AGE = float(os.getenv("STALE_MAX_AGE", "3600"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 DB를 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """최근 호출의 실패/지연 비율로 DB 호출을 차단하고, 일정 시간 뒤 한 번 시험 호출"""
+
+    def __init__(
+        self,
+        window: int = CIRCUIT_WINDOW,
+        min_calls: int = CIRCUIT_MIN_CALLS,
+        failure_rate: float = CIRCUIT_FAILURE_RATE,
+        slow_call_ms: float = CIRCUIT_SLOW_CALL_MS,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+    ):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_ms = slow_call_ms
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.opened_count = 0
+        self.rejected_calls = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def is_open(self) -> bool:
+        """차단 중인지 (시험 호출 대기 시간이 지났으면 False)"""
+        with self._lock:
+            return (
+                self._state == OPEN
+                and time.monotonic() - self._opened_at < self.open_seconds
+            )
+
+    def before_call(self) -> None:
+        """호출 전 확인 (차단 중이면 CircuitOpenError)"""
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.rejected_calls += 1
+                    raise CircuitOpenError()
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN:
+                # 시험 호출은 하나만
+                if self._trial_in_flight:
+                    self.rejected_calls += 1
+                    raise CircuitOpenError()
+                self._trial_in_flight = True
+
+    def record(self, success: bool, duration_ms: float) -> None:
+        """호출 결과 기록"""
+        failed = not success or duration_ms > self.slow_call_ms
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trial_in_flight = False
+                if failed:
+                    self._open()
+                else:
+                    logger.info("Database circuit closed")
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(failed)
+            if (
+                self._state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        logger.warning("Database circuit opened for %.0fs", self.open_seconds)
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self.opened_count += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "recent_calls": len(self._outcomes),
+                "recent_failures": sum(self._outcomes),
+                "opened_count": self.opened_count,
+                "rejected_calls": self.rejected_calls,
+            }
@@ -0,0 +1,50 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+# 삭제 기록(comment_tombstones) 보관 일수. 이보다 오래된 since는 410 (전체 다시 조회)
+COMMENT_SYNC_WINDOW_DAYS = int(os.getenv("COMMENT_SYNC_WINDOW_DAYS", "30"))
+# 늦게 커밋된 트랜잭션(더 이른 NOW()로 기록된 행)을 놓치지 않도록 cursor를 이만큼 뒤로
+COMMENT_SYNC_MARGIN_SECONDS = float(os.getenv("COMMENT_SYNC_MARGIN_SECONDS", "5"))
+
+
+class SyncWindowExpired(Exception):
+    """since가 삭제 기록 보관 기간보다 오래됨"""
+
+
+def check_since(since: datetime, window_days: int = COMMENT_SYNC_WINDOW_DAYS) -> datetime:
+    """since를 UTC 기준으로 맞추고 보관 기간 밖이면 SyncWindowExpired"""
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if since < datetime.now(timezone.utc) - timedelta(days=window_days):
+        raise SyncWindowExpired()
+    return since
+
+
+def next_cursor(
+    since: datetime,
+    timestamps: list[datetime],
+    now: Callable[[], datetime],
+    margin_seconds: float = COMMENT_SYNC_MARGIN_SECONDS,
+) -> datetime:
+    """가장 최근 변경 시각(없으면 now())에서 margin만큼 뒤로 물린 cursor (since보다 앞으로 가지는 않음)
+
+    변경이 없어도 cursor가 앞으로 가야 조용한 게시글이 보관 기간을 넘겨 410을 받지 않음.
+    margin 안의 행은 다음 응답에도 다시 올 수 있음 (클라이언트는 id 기준으로 덮어씀)
+    """
+    latest = max(timestamps) if timestamps else now()
+    return max(since, latest - timedelta(seconds=margin_seconds))
+
+
+def database_now(client) -> datetime:
+    """DB 서버 시각 (updated_at/deleted_at과 같은 시계로 cursor를 맞춤)"""
+    now = client.rpc("db_now", {}).execute().data
+    return datetime.fromisoformat(now) if isinstance(now, str) else now
+
+
+def prune_tombstones(client, window_days: int = COMMENT_SYNC_WINDOW_DAYS) -> int:
+    """보관 기간이 지난 삭제 기록 정리 (경계의 since도 응답할 수 있도록 하루 더 보관)"""
+    response = client.rpc(
+        "prune_comment_tombstones", {"keep_days": window_days + 1}
+    ).execute()
+    return response.data or 0
@@ -0,0 +1,26 @@
+import os
+
+# 추정치가 이 값 이상이면 추정치 사용, 미만이면 정확한 count(*)
+COUNT_EXACT_THRESHOLD = int(os.getenv("COUNT_EXACT_THRESHOLD", "10000"))
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "10"))
+
+
+def count_rows(
+    supabase, table: str, threshold: int = COUNT_EXACT_THRESHOLD
+) -> tuple[int, bool]:
+    """(행 수, 추정치 여부) 반환
+
+    먼저 플래너 추정치(planned)를 구하고, 작은 테이블이면 정확히 센다.
+    """
+    from postgrest.types import CountMethod
+
+    planned = (
+        supabase.table(table).select("id", count=CountMethod.planned, head=True).execute()
+    ).count or 0
+    if planned >= threshold:
+        return planned, True
+
+    exact = (
+        supabase.table(table).select("id", count=CountMethod.exact, head=True).execute()
+    ).count or 0
+    return exact, False
@@ -1,18 +1,145 @@
+import logging
 import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import threading
+import time
 
-load_dotenv()
+from circuit import CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# 데이터 접근 백엔드: supabase (PostgREST) | postgres (직접 연결)
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase")
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
+# DB_BACKEND=postgres 일 때 사용
+DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_POOL_MIN = int(os.getenv("DATABASE_POOL_MIN", "1"))
+DATABASE_POOL_MAX = int(os.getenv("DATABASE_POOL_MAX", "10"))
+
+# PostgREST HTTP 커넥션 풀 설정
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "20"))
+SUPABASE_POOL_KEEPALIVE = int(os.getenv("SUPABASE_POOL_KEEPALIVE", "10"))
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "30"))
+SUPABASE_HTTP2 = os.getenv("SUPABASE_HTTP2", "true").lower() == "true"
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "5"))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "2"))
+SUPABASE_READ_RETRIES = int(os.getenv("SUPABASE_READ_RETRIES", "2"))
+SUPABASE_RETRY_BACKOFF = float(os.getenv("SUPABASE_RETRY_BACKOFF", "0.05"))
+
+# DB 장애/지연 시 호출을 차단하는 회로 차단기 (두 백엔드 공용)
+breaker = CircuitBreaker()
+
+# 클라이언트와 커넥션 풀은 처음 사용할 때 만든다
+# (import 시에는 supabase/httpx import, 연결, 설정 검증을 하지 않음)
+_lock = threading.RLock()
+_client = None
+_transport = None
+
+
+def _reset_after_fork() -> None:
+    """fork된 자식은 부모의 소켓/락을 물려받지 않고 처음 사용할 때 새로 만듦"""
+    global _lock, _client, _transport
+    _lock = threading.RLock()
+    _client = None
+    _transport = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _create_client():
+    if DB_BACKEND == "postgres":
+        if not DATABASE_URL:
+            raise ValueError("DATABASE_URL must be set when DB_BACKEND=postgres")
+        from pg_database import PostgresClient
+
+        return PostgresClient(
+            DATABASE_URL,
+            min_size=DATABASE_POOL_MIN,
+            max_size=DATABASE_POOL_MAX,
+            breaker=breaker,
+        )
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
+    from supabase_client import create_client
+
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+def get_supabase():
+    """Supabase 클라이언트 반환 (DB_BACKEND=postgres면 호환 클라이언트)"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                started = time.perf_counter()
+                _client = _create_client()
+                logger.info(
+                    "Database client (%s) created in %.1fms",
+                    DB_BACKEND,
+                    (time.perf_counter() - started) * 1000,
+                )
+    return _client
+
+
+def get_transport():
+    """PostgREST 세션이 공유하는 커넥션 풀 (PooledTransport)"""
+    global _transport
+    if _transport is None:
+        with _lock:
+            if _transport is None:
+                from supabase_client import create_transport
+
+                _transport = create_transport()
+    return _transport
+
+
+def get_pool_stats() -> dict | None:
+    """사용 중인 백엔드의 커넥션 풀 통계 반환 (아직 만들지 않았으면 None)"""
+    if DB_BACKEND == "postgres":
+        return _client.stats() if _client is not None else None
+    # 통계를 보려고 풀(과 supabase import)을 만들지는 않음
+    return _transport.stats() if _transport is not None else None
+
+
+def get_circuit_stats() -> dict:
+    """DB 회로 차단기 상태 반환"""
+    return breaker.stats()
+
+
+# PostgREST가 DB 장애로 돌려주는 오류 코드 (연결 실패 PGRST0xx, SQLSTATE 08/53/57/58 클래스)
+_UNAVAILABLE_SQLSTATE_CLASSES = ("08", "53", "57", "58")
+
+
+def is_unavailable_error(error: BaseException) -> bool:
+    """DB 장애(연결 실패, 풀 대기 초과, 회로 차단, 5xx)로 인한 오류인지 (코드 오류는 False)"""
+    if isinstance(error, CircuitOpenError):
+        return True
+    if DB_BACKEND == "postgres":
+        from psycopg import OperationalError
+        from psycopg_pool import PoolTimeout
+
+        return isinstance(error, (OperationalError, PoolTimeout))
+
+    import httpx
+    from postgrest.exceptions import APIError
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    if isinstance(error, httpx.TransportError):
+        return True
+    if not isinstance(error, APIError):
+        return False
+    code = str(error.code or "")
+    if code.isdigit() and len(code) == 3:
+        # JSON 본문이 없는 응답은 HTTP 상태 코드가 code
+        return int(code) >= 500
+    return code.startswith("PGRST0") or code[:2] in _UNAVAILABLE_SQLSTATE_CLASSES
 
 
-def get_supabase() -> Client:
-    """Supabase 클라이언트 반환"""
-    return supabase
+def fail_fast_if_circuit_open() -> None:
+    """DB 회로가 차단 중이면 쓰기 작업(비밀번호 해시 등) 전에 바로 CircuitOpenError"""
+    if breaker.is_open():
+        raise CircuitOpenError()
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Callable
+
+from cache import TTLCache
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "86400"))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+# 워커/인스턴스 간 중복 방지에 idempotency_keys 테이블 사용 (false면 워커 안에서만)
+IDEMPOTENCY_SHARED = os.getenv("IDEMPOTENCY_SHARED", "true").lower() == "true"
+# 처리 중인 키를 다른 요청이 다시 실행하지 못하는 시간(초, 처리하던 워커가 죽은 경우 대비)
+IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60"))
+
+
+class IdempotencyKeyReused(Exception):
+    """같은 키가 다른 요청 본문으로 재사용됨"""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """같은 키의 요청을 다른 워커가 처리 중"""
+
+
+def fingerprint(payload: Any) -> str:
+    """요청 본문 비교용 해시 (원문은 저장하지 않음)"""
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """Idempotency-Key별 응답을 일정 시간 보관해 재시도 요청에 그대로 돌려줌
+
+    get_client가 있으면 idempotency_keys 테이블에 키를 먼저 선점해 다른 워커로 간
+    재시도도 막고, 워커 안의 캐시는 재생 응답을 DB 조회 없이 돌려주는 데 씀.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = IDEMPOTENCY_MAX_KEYS,
+        ttl: float = IDEMPOTENCY_TTL,
+        get_client: Callable[[], Any] | None = None,
+        lease_seconds: int = IDEMPOTENCY_LEASE_SECONDS,
+    ):
+        self.ttl = ttl
+        self.lease_seconds = lease_seconds
+        self._get_client = get_client
+        self._responses = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._flight = SingleFlight()
+
+    def run(
+        self, scope: str, key: str, payload: Any, fn: Callable[[], Any]
+    ) -> tuple[Any, bool]:
+        """(응답, 재생 여부) 반환. 실패한 요청은 저장하지 않아 다시 시도할 수 있음"""
+        request_hash = fingerprint(payload)
+        executed = False
+
+        def execute():
+            nonlocal executed
+            if self._get_client is not None:
+                shared = self._claim(scope, key, request_hash)
+                if shared is not None:
+                    return shared
+            executed = True
+            try:
+                response = fn()
+            except BaseException:
+                if self._get_client is not None:
+                    self._release(scope, key)
+                raise
+            if self._get_client is not None:
+                # 이미 반영된 요청이므로 기록에 실패해도 응답은 돌려줌 (이 워커에서는 캐시로 재생)
+                try:
+                    self._complete(scope, key, response)
+                except Exception as e:
+                    logger.warning("Failed to store idempotent response %s/%s: %s", scope, key, e)
+            stored = (request_hash, response)
+            self._responses.set((scope, key), stored)
+            return stored
+
+        stored = self._responses.get((scope, key))
+        if stored is None:
+            # 동시에 들어온 같은 키의 재시도는 처음 요청의 결과를 기다림
+            stored = self._flight.do((scope, key), execute)
+
+        if stored[0] != request_hash:
+            raise IdempotencyKeyReused()
+        return stored[1], not executed
+
+    def _claim(self, scope: str, key: str, request_hash: str) -> tuple[str, Any] | None:
+        """키를 선점하면 None, 이미 있으면 (request_hash, 응답)"""
+        existing = (
+            self._get_client()
+            .rpc(
+                "claim_idempotency_key",
+                {
+                    "key_scope": scope,
+                    "idempotency_key": key,
+                    "payload_hash": request_hash,
+                    "ttl_seconds": int(self.ttl),
+                    "lease_seconds": self.lease_seconds,
+                },
+            )
+            .execute()
+            .data
+        )
+        if existing is None:
+            return None
+        if existing["request_hash"] == request_hash and existing["response"] is None:
+            raise IdempotencyKeyInProgress()
+        stored = (existing["request_hash"], existing["response"])
+        if existing["response"] is not None:
+            self._responses.set((scope, key), stored)
+        return stored
+
+    def _complete(self, scope: str, key: str, response: Any) -> None:
+        self._get_client().rpc(
+            "complete_idempotency_key",
+            {
+                "key_scope": scope,
+                "idempotency_key": key,
+                "response_json": json.dumps(response, ensure_ascii=False, default=str),
+            },
+        ).execute()
+
+    def _release(self, scope: str, key: str) -> None:
+        self._get_client().rpc(
+            "release_idempotency_key", {"key_scope": scope, "idempotency_key": key}
+        ).execute()
+
+    def prune(self) -> int:
+        """만료된 공유 키 삭제 (공유하지 않으면 0)"""
+        if self._get_client is None:
+            return 0
+        response = (
+            self._get_client()
+            .rpc("prune_idempotency_keys", {"ttl_seconds": int(self.ttl)})
+            .execute()
+        )
+        return response.data or 0
+
+    def clear(self) -> None:
+        self._responses.clear()
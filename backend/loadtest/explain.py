@@ -0,0 +1,277 @@
+"""쿼리 실행 계획 점검 도구
+
+앱이 실행하는 쿼리 모양마다 EXPLAIN을 실행해 큰 테이블의 순차 스캔(Seq Scan)과
+정렬(Sort)을 찾고, 그 쿼리를 처리해야 할 복합 인덱스를 제안(--apply면 생성)한다.
+SQL은 DB_BACKEND=postgres가 실행하는 것과 같은 PostgresQuery로 만든다.
+loadtest.seed로 채운 Postgres에서 실행한다.
+
+    python -m loadtest.explain --database-url postgresql://... [--apply]
+"""
+
+import argparse
+import os
+import sys
+from typing import Callable, Iterator
+
+from psycopg import sql
+
+from pg_database import PostgresQuery
+
+# 이 행 수보다 작은 테이블은 순차 스캔/정렬이 더 싸므로 점검하지 않음
+SEQ_SCAN_MIN_ROWS = 10_000
+
+POST_COLUMNS = "id, title, content, content_html, author_name, view_count, created_at, updated_at"
+COMMENT_COLUMNS = (
+    "id, post_id, parent_id, content, content_html, author_name, created_at, updated_at"
+)
+
+
+class QueryShape:
+    """앱이 실행하는 쿼리 하나와 그 쿼리를 처리해야 할 인덱스"""
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[dict], tuple[sql.Composable, list]],
+        table: str,
+        index: tuple[str, ...] | None = None,
+        full_scan: bool = False,
+        index_name: str | None = None,
+    ):
+        self.name = name
+        self.build = build
+        self.table = table
+        self.index = index
+        # schema.sql에 같은 인덱스가 다른 이름으로 있으면 그 이름 (--apply가 중복 생성하지 않도록)
+        self.index_name = index_name
+        # 전체 행을 반환하는 쿼리는 순차 스캔이 정상
+        self.full_scan = full_scan
+
+    def index_sql(self) -> str | None:
+        if self.index is None:
+            return None
+        name = self.index_name or "_".join(
+            ["idx", self.table] + [c.split()[0] for c in self.index]
+        )
+        return f"CREATE INDEX IF NOT EXISTS {name} ON {self.table} ({', '.join(self.index)})"
+
+
+def _query(table: str) -> PostgresQuery:
+    # SQL 생성만 하므로 클라이언트는 필요 없음
+    return PostgresQuery(None, table)
+
+
+QUERY_SHAPES = [
+    QueryShape(
+        "post_list",
+        lambda p: _query("posts").select(POST_COLUMNS).order("created_at", desc=True).build(),
+        "posts",
+        full_scan=True,
+    ),
+    QueryShape(
+        "post_detail",
+        lambda p: _query("posts").select(POST_COLUMNS).eq("id", p["post_id"]).build(),
+        "posts",
+    ),
+    QueryShape(
+        "post_batch",
+        lambda p: _query("posts").select(POST_COLUMNS).in_("id", p["post_ids"]).build(),
+        "posts",
+    ),
+    QueryShape(
+        "archived_post",
+        lambda p: _query("posts_archive").select(POST_COLUMNS).eq("id", p["post_id"]).build(),
+        "posts_archive",
+    ),
+    QueryShape(
+        "comments_by_post",
+        lambda p: _query("comments")
+        .select(COMMENT_COLUMNS)
+        .eq("post_id", p["post_id"])
+        .order("created_at")
+        .build(),
+        "comments",
+        ("post_id", "created_at"),
+    ),
+    QueryShape(
+        "archived_comments_by_post",
+        lambda p: _query("comments_archive")
+        .select(COMMENT_COLUMNS)
+        .eq("post_id", p["post_id"])
+        .order("created_at")
+        .build(),
+        "comments_archive",
+        ("post_id", "created_at"),
+        index_name="idx_comments_archive_post_id",
+    ),
+    QueryShape(
+        "comment_changes",
+        lambda p: _query("comments")
+        .select(COMMENT_COLUMNS)
+        .eq("post_id", p["post_id"])
+        .gte("updated_at", p["since"])
+        .order("updated_at")
+        .build(),
+        "comments",
+        ("post_id", "updated_at"),
+    ),
+    QueryShape(
+        "comment_tombstones",
+        lambda p: _query("comment_tombstones")
+        .select("comment_id, deleted_at")
+        .eq("post_id", p["post_id"])
+        .gte("deleted_at", p["since"])
+        .build(),
+        "comment_tombstones",
+        ("post_id", "deleted_at"),
+        index_name="idx_comment_tombstones_post_id",
+    ),
+    QueryShape(
+        "comment_password",
+        lambda p: _query("comments").select("id, password").eq("id", p["comment_id"]).build(),
+        "comments",
+    ),
+    QueryShape(
+        "archive_candidates",
+        lambda p: _query("posts")
+        .select("id")
+        .lt("last_activity_at", p["since"])
+        .order("last_activity_at")
+        .limit(1000)
+        .build(),
+        "posts",
+        ("last_activity_at DESC", "id DESC"),
+        index_name="idx_posts_last_activity",
+    ),
+    QueryShape(
+        # activity_feed() 함수 본문의 내부 쿼리
+        "activity_feed",
+        lambda p: (
+            sql.SQL(
+                "SELECT id FROM posts WHERE (last_activity_at, id) < (%s, %s) "
+                "ORDER BY last_activity_at DESC, id DESC LIMIT %s"
+            ),
+            [p["before_at"], p["post_id"], 21],
+        ),
+        "posts",
+        ("last_activity_at DESC", "id DESC"),
+        index_name="idx_posts_last_activity",
+    ),
+]
+
+
+def plan_nodes(plan: dict) -> Iterator[dict]:
+    """실행 계획 트리의 모든 노드"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def find_problems(
+    plan: dict,
+    table_rows: dict[str, float],
+    shape: QueryShape,
+    min_rows: int = SEQ_SCAN_MIN_ROWS,
+) -> list[str]:
+    """큰 테이블을 읽는 계획의 Seq Scan/Sort 노드"""
+    nodes = list(plan_nodes(plan))
+    relations = {n["Relation Name"] for n in nodes if "Relation Name" in n}
+    if shape.full_scan or all(table_rows.get(r, 0) < min_rows for r in relations):
+        return []
+
+    problems = []
+    for node in nodes:
+        if (
+            node["Node Type"] == "Seq Scan"
+            and table_rows.get(node["Relation Name"], 0) >= min_rows
+        ):
+            problems.append(f"Seq Scan on {node['Relation Name']}")
+        elif node["Node Type"] == "Sort":
+            problems.append(f"Sort on {', '.join(node.get('Sort Key', []))}")
+    return problems
+
+
+def sample_params(conn) -> dict:
+    """가장 댓글이 많은 게시글 등 실제 데이터 기준 파라미터"""
+    row = conn.execute(
+        "SELECT id, last_activity_at FROM posts ORDER BY comment_count DESC LIMIT 1"
+    ).fetchone()
+    post_id, last_activity_at = row if row else (1, "now")
+    comment = conn.execute(
+        "SELECT id FROM comments WHERE post_id = %s LIMIT 1", [post_id]
+    ).fetchone()
+    return {
+        "post_id": post_id,
+        "post_ids": list(range(post_id, post_id + 20)),
+        "comment_id": comment[0] if comment else 1,
+        "since": "2000-01-01T00:00:00+00:00",
+        "before_at": last_activity_at,
+    }
+
+
+def table_sizes(conn) -> dict[str, float]:
+    """테이블별 예상 행 수 (ANALYZE 기준)"""
+    rows = conn.execute(
+        "SELECT relname, GREATEST(reltuples, 0) FROM pg_class "
+        "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+    ).fetchall()
+    return {name: estimate for name, estimate in rows}
+
+
+def explain(conn, query: sql.Composable, params: list) -> dict:
+    cur = conn.execute(sql.SQL("EXPLAIN (FORMAT JSON) {}").format(query), params)
+    return cur.fetchone()[0][0]["Plan"]
+
+
+def check(
+    conn, shapes: list[QueryShape] = QUERY_SHAPES, min_rows: int = SEQ_SCAN_MIN_ROWS
+) -> list[dict]:
+    """쿼리 모양마다 {name, problems, suggestion} 반환"""
+    params = sample_params(conn)
+    sizes = table_sizes(conn)
+    results = []
+    for shape in shapes:
+        query, query_params = shape.build(params)
+        problems = find_problems(explain(conn, query, query_params), sizes, shape, min_rows)
+        results.append(
+            {
+                "name": shape.name,
+                "problems": problems,
+                "suggestion": shape.index_sql() if problems else None,
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check query plans for the app's queries")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--min-rows", type=int, default=SEQ_SCAN_MIN_ROWS)
+    parser.add_argument("--apply", action="store_true", help="제안한 인덱스를 생성")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    import psycopg
+
+    with psycopg.connect(args.database_url, autocommit=True) as conn:
+        results = check(conn, min_rows=args.min_rows)
+        for result in results:
+            status = "FLAG" if result["problems"] else "ok"
+            print(f"{status:4} {result['name']}: {'; '.join(result['problems']) or '-'}")
+            if result["suggestion"]:
+                print(f"     {result['suggestion']};")
+
+        suggestions = sorted({r["suggestion"] for r in results if r["suggestion"]})
+        if args.apply and suggestions:
+            for statement in suggestions:
+                conn.execute(statement)
+            conn.execute("ANALYZE")
+            print(f"created {len(suggestions)} indexes")
+        elif suggestions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
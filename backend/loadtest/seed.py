@@ -0,0 +1,249 @@
+"""대용량 테스트 데이터 생성기
+
+schema.sql이 적용된 Postgres(DATABASE_URL)에 COPY로 게시글/댓글을 채운다.
+조회수는 소수 게시글에 몰리는 멱법칙 분포, 댓글은 parent_id로 이어지는
+깊은 대댓글 체인을 포함한다.
+
+    python -m loadtest.seed --posts 1000000 --comments-per-post 5 --max-depth 50 \
+        --reply-probability 0.98
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator
+
+import bcrypt
+
+AUTHORS = ["익명", "홍길동", "김철수", "이영희", "박민수", "최지우"]
+# 대댓글 체인을 이어갈 확률 (0.7이면 평균 약 3단계, 0.98이면 약 50단계)
+DEFAULT_REPLY_PROBABILITY = 0.7
+
+WORDS = ["게시판", "질문", "답변", "공유", "후기", "정보", "오늘", "개발", "파이썬", "데이터"]
+
+
+def skewed_view_count(rank: int, max_views: int, skew: float = 1.1) -> int:
+    """rank(1부터)가 낮을수록 조회수가 큰 Zipf 분포 조회수"""
+    return int(max_views / (rank**skew))
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate_posts(
+    count: int,
+    start_id: int,
+    password_hash: str,
+    days: int = 365,
+    max_views: int = 1_000_000,
+    seed: int = 0,
+) -> Iterator[tuple]:
+    """(id, title, content, author_name, password, view_count, created_at, updated_at,
+    last_activity_at)"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    # 인기 순위를 섞어서 최신 글만 조회수가 높지 않도록 함
+    ranks = list(range(1, count + 1))
+    rng.shuffle(ranks)
+    for i in range(count):
+        created_at = now - timedelta(seconds=rng.uniform(0, days * 86400))
+        yield (
+            start_id + i,
+            random_text(rng, rng.randint(2, 8)),
+            random_text(rng, rng.randint(10, 200)),
+            rng.choice(AUTHORS),
+            password_hash,
+            skewed_view_count(ranks[i], max_views),
+            created_at,
+            created_at,
+            created_at,  # 댓글 적재 시 트리거가 마지막 댓글 시각으로 갱신
+        )
+
+
+def generate_comments(
+    posts: Iterable[tuple[int, datetime]],
+    comments_per_post: float,
+    max_depth: int,
+    start_id: int,
+    password_hash: str,
+    seed: int = 0,
+    reply_probability: float = DEFAULT_REPLY_PROBABILITY,
+) -> Iterator[tuple]:
+    """(id, post_id, parent_id, content, author_name, password, created_at, updated_at)
+
+    posts는 (post_id, created_at). 게시글마다 평균 comments_per_post개의 댓글을
+    게시글 작성 이후 ~ 현재 사이 시각으로 만들고, 일부는 이전 댓글에 이어지는
+    대댓글 체인(최대 max_depth 단계)으로 만든다. 체인의 평균 길이는
+    1 / (1 - reply_probability).
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    comment_id = start_id
+    for post_id, post_created_at in posts:
+        n = int(rng.expovariate(1 / comments_per_post)) if comments_per_post else 0
+        parent_id = None
+        depth = 0
+        created_at = post_created_at
+        for _ in range(n):
+            # 체인을 이어갈지, 새 최상위 댓글을 시작할지
+            if (
+                parent_id is not None
+                and depth < max_depth
+                and rng.random() < reply_probability
+            ):
+                depth += 1
+            else:
+                parent_id = None
+                depth = 0
+            # 미래 시각은 트리거를 통해 last_activity_at까지 앞당기므로 현재로 제한
+            created_at = min(created_at + timedelta(seconds=rng.uniform(1, 3600)), now)
+            yield (
+                comment_id,
+                post_id,
+                parent_id,
+                random_text(rng, rng.randint(3, 40)),
+                rng.choice(AUTHORS),
+                password_hash,
+                created_at,
+                created_at,
+            )
+            parent_id = comment_id
+            comment_id += 1
+
+
+def _copy(conn, table: str, columns: tuple[str, ...], rows: Iterator[tuple]) -> int:
+    count = 0
+    with conn.cursor() as cur:
+        with cur.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+    return count
+
+
+def seed(
+    database_url: str,
+    posts: int,
+    comments_per_post: float,
+    max_depth: int,
+    days: int,
+    max_views: int,
+    random_seed: int = 0,
+    reply_probability: float = DEFAULT_REPLY_PROBABILITY,
+) -> dict:
+    """데이터를 생성해 적재하고 건수를 반환"""
+    import psycopg
+
+    # 모든 행이 같은 해시를 공유 (비밀번호: "1234")
+    password_hash = bcrypt.hashpw(b"1234", bcrypt.gensalt()).decode("utf-8")
+
+    with psycopg.connect(database_url) as conn, psycopg.connect(database_url) as reader:
+        post_start = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM posts").fetchone()[0]
+        comment_start = conn.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM comments"
+        ).fetchone()[0]
+
+        post_count = _copy(
+            conn,
+            "posts",
+            ("id", "title", "content", "author_name", "password", "view_count",
+             "created_at", "updated_at", "last_activity_at"),
+            generate_posts(posts, post_start, password_hash, days, max_views, random_seed),
+        )
+        conn.commit()
+
+        # 댓글 시각을 게시글 작성 이후로 맞추기 위해 작성 시각을 서버 측 커서로 읽어옴
+        # (게시글 전체를 메모리에 두지 않음)
+        with reader.cursor(name="seed_post_times") as post_times:
+            post_times.execute(
+                "SELECT id, created_at FROM posts WHERE id >= %s ORDER BY id", [post_start]
+            )
+            # 댓글마다 게시글을 한 번씩 UPDATE하지 않도록 적재 중에는 댓글 수 트리거를 끄고
+            # 끝난 뒤 게시글마다 한 번만 반영
+            conn.execute("ALTER TABLE comments DISABLE TRIGGER trg_comments_count")
+            comment_count = _copy(
+                conn,
+                "comments",
+                ("id", "post_id", "parent_id", "content", "author_name", "password",
+                 "created_at", "updated_at"),
+                generate_comments(
+                    post_times,
+                    comments_per_post,
+                    max_depth,
+                    comment_start,
+                    password_hash,
+                    random_seed,
+                    reply_probability,
+                ),
+            )
+            conn.execute("ALTER TABLE comments ENABLE TRIGGER trg_comments_count")
+        conn.execute(
+            """
+            UPDATE posts p
+            SET comment_count = p.comment_count + c.total,
+                last_activity_at = GREATEST(p.last_activity_at, c.last_at)
+            FROM (
+                SELECT post_id, count(*) AS total, max(created_at) AS last_at
+                FROM comments WHERE id >= %s GROUP BY post_id
+            ) c
+            WHERE p.id = c.post_id
+            """,
+            [comment_start],
+        )
+
+        # 명시적 id로 넣었으므로 시퀀스를 맞춤
+        conn.execute("SELECT setval('posts_id_seq', (SELECT MAX(id) FROM posts))")
+        conn.execute("SELECT setval('comments_id_seq', (SELECT MAX(id) FROM comments))")
+        conn.commit()
+
+        # 일괄 UPDATE로 생긴 이전 행 버전을 정리하고 통계 갱신
+        conn.autocommit = True
+        conn.execute("VACUUM ANALYZE posts")
+        conn.execute("VACUUM ANALYZE comments")
+
+    return {"posts": post_count, "comments": comment_count}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the board with synthetic data")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--comments-per-post", type=float, default=5)
+    parser.add_argument("--max-depth", type=int, default=20, help="최대 대댓글 깊이")
+    parser.add_argument(
+        "--reply-probability",
+        type=float,
+        default=DEFAULT_REPLY_PROBABILITY,
+        help="대댓글 체인을 이어갈 확률 (깊은 체인은 0.95 이상)",
+    )
+    parser.add_argument("--days", type=int, default=365, help="created_at 분포 기간")
+    parser.add_argument("--max-views", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    started = time.perf_counter()
+    counts = seed(
+        args.database_url,
+        args.posts,
+        args.comments_per_post,
+        args.max_depth,
+        args.days,
+        args.max_views,
+        args.seed,
+        args.reply_probability,
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"seeded {counts['posts']} posts, {counts['comments']} comments "
+        f"in {elapsed:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
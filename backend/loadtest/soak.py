@@ -0,0 +1,220 @@
+"""소크(장시간 부하) 테스트 드라이버
+
+실행 중인 API에 읽기/쓰기 혼합 트래픽을 지정한 시간 동안 보내고, 주기마다
+처리량, 지연 시간 백분위수, 오류 수, 메모리(RSS) 변화를 출력한다.
+
+    python -m loadtest.soak --base-url http://localhost:8000 --duration 7200 \\
+        --concurrency 64 --max-post-id 1000000 --pid $(pgrep -f uvicorn | head -1)
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+# 작업별 비중 (읽기 위주)
+DEFAULT_MIX = {
+    "list_posts": 35,
+    "get_post": 35,
+    "get_comments": 20,
+    "create_comment": 5,
+    "create_post": 3,
+    "update_post": 2,
+}
+PASSWORD = "1234"
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def read_rss_kb(pid: int) -> int | None:
+    """/proc에서 프로세스 RSS(kB) 조회"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+class Stats:
+    """구간별 지연 시간/오류 집계"""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, op: str, seconds: float, ok: bool) -> None:
+        self.latencies[op].append(seconds)
+        if not ok:
+            self.errors[op] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        ops = {}
+        total = 0
+        for op, values in sorted(self.latencies.items()):
+            values.sort()
+            total += len(values)
+            ops[op] = {
+                "count": len(values),
+                "errors": self.errors[op],
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+            }
+        return {"rps": round(total / elapsed, 1) if elapsed else 0.0, "ops": ops}
+
+
+class SoakTest:
+    def __init__(
+        self,
+        base_url: str,
+        duration: float,
+        concurrency: int,
+        max_post_id: int,
+        mix: dict[str, int],
+        skew: float = 1.1,
+        pid: int | None = None,
+        seed: int = 0,
+    ):
+        self.base_url = base_url
+        self.duration = duration
+        self.concurrency = concurrency
+        self.max_post_id = max_post_id
+        self.ops = list(mix.keys())
+        self.weights = list(mix.values())
+        self.skew = skew
+        self.pid = pid
+        self.rng = random.Random(seed)
+        self.stats = Stats()
+        self.created_post_ids: list[int] = []
+
+    def pick_post_id(self) -> int:
+        # 인기 게시글에 요청이 몰리는 분포 (1 근처 id가 가장 인기)
+        rank = int(self.rng.paretovariate(self.skew))
+        return min(rank, self.max_post_id)
+
+    async def run_op(self, client: httpx.AsyncClient, op: str) -> bool:
+        if op == "list_posts":
+            response = await client.get("/api/posts")
+        elif op == "get_post":
+            response = await client.get(f"/api/posts/{self.pick_post_id()}")
+            return response.status_code in (200, 404)
+        elif op == "get_comments":
+            response = await client.get(f"/api/posts/{self.pick_post_id()}/comments")
+        elif op == "create_comment":
+            response = await client.post(
+                f"/api/posts/{self.pick_post_id()}/comments",
+                json={"content": "soak comment", "password": PASSWORD},
+            )
+            return response.status_code in (201, 404)
+        elif op == "create_post":
+            response = await client.post(
+                "/api/posts",
+                json={"title": "soak", "content": "soak content", "password": PASSWORD},
+            )
+            if response.status_code == 201:
+                self.created_post_ids.append(response.json()["id"])
+        elif op == "update_post":
+            if not self.created_post_ids:
+                return True
+            post_id = self.rng.choice(self.created_post_ids)
+            response = await client.put(
+                f"/api/posts/{post_id}",
+                json={"title": "soak edited", "content": "edited", "password": PASSWORD},
+            )
+        else:
+            raise ValueError(f"Unknown op: {op}")
+        return response.is_success
+
+    async def worker(self, client: httpx.AsyncClient, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            op = self.rng.choices(self.ops, self.weights)[0]
+            started = time.perf_counter()
+            try:
+                ok = await self.run_op(client, op)
+            except httpx.HTTPError:
+                ok = False
+            self.stats.record(op, time.perf_counter() - started, ok)
+
+    async def reporter(self, deadline: float, interval: float) -> list[dict]:
+        reports = []
+        started = time.monotonic()
+        baseline_rss = read_rss_kb(self.pid) if self.pid else None
+        while time.monotonic() < deadline:
+            window_start = time.monotonic()
+            await asyncio.sleep(min(interval, max(0.0, deadline - window_start)))
+            window = self.stats
+            self.stats = Stats()
+            report = window.summary(time.monotonic() - window_start)
+            report["elapsed_s"] = round(time.monotonic() - started, 1)
+            if self.pid:
+                rss = read_rss_kb(self.pid)
+                report["rss_kb"] = rss
+                if rss is not None and baseline_rss is not None:
+                    report["rss_growth_kb"] = rss - baseline_rss
+            print(json.dumps(report, ensure_ascii=False), flush=True)
+            reports.append(report)
+        return reports
+
+    async def run(self, interval: float) -> list[dict]:
+        deadline = time.monotonic() + self.duration
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with httpx.AsyncClient(
+            base_url=self.base_url, limits=limits, timeout=30
+        ) as client:
+            workers = [self.worker(client, deadline) for _ in range(self.concurrency)]
+            results = await asyncio.gather(self.reporter(deadline, interval), *workers)
+        return results[0]
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """'get_post=50,list_posts=50' 형태의 작업 비중 파싱"""
+    mix = {}
+    for part in value.split(","):
+        op, weight = part.split("=")
+        if op not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown op: {op}")
+        mix[op] = int(weight)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Soak test the board API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=3600, help="초 단위 실행 시간")
+    parser.add_argument("--interval", type=float, default=60, help="리포트 주기(초)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-post-id", type=int, default=100_000)
+    parser.add_argument("--skew", type=float, default=1.1, help="게시글 인기 분포 기울기")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument("--pid", type=int, help="메모리 증가를 추적할 API 프로세스 PID")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    soak = SoakTest(
+        args.base_url,
+        args.duration,
+        args.concurrency,
+        args.max_post_id,
+        args.mix,
+        skew=args.skew,
+        pid=args.pid,
+        seed=args.seed,
+    )
+    asyncio.run(soak.run(args.interval))
+
+
+if __name__ == "__main__":
+    main()
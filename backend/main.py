@@ -1,11 +1,158 @@
+import time
+
+_import_started = time.perf_counter()
+
+from dotenv import load_dotenv
+
+# 모듈 설정 상수가 .env 값을 읽도록 다른 모듈보다 먼저 로드
+load_dotenv()
+
+from collections import Counter
+import base64
+from contextlib import asynccontextmanager
+import json
 from datetime import datetime
-from fastapi import FastAPI, HTTPException, Body
+from typing import NoReturn
+from fastapi import FastAPI, HTTPException, Body, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import bcrypt
-from database import get_supabase
+from archive import (
+    ArchiveJob,
+    ARCHIVE_AFTER_DAYS,
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_INTERVAL_SECONDS,
+)
+from background import BackgroundQueue
+from cache import TTLCache
+from comment_sync import (
+    SyncWindowExpired,
+    check_since,
+    database_now,
+    next_cursor,
+    prune_tombstones,
+)
+from counts import COUNT_CACHE_TTL, count_rows
+from circuit import (
+    CircuitOpenError,
+    CIRCUIT_OPEN_SECONDS,
+    STALE_CACHE_SIZE,
+    STALE_MAX_AGE,
+)
+from database import (
+    fail_fast_if_circuit_open,
+    get_circuit_stats,
+    get_pool_stats,
+    get_supabase,
+    is_unavailable_error,
+)
+from idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyReused,
+    IdempotencyStore,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    IDEMPOTENCY_SHARED,
+)
+from maintenance import MaintenanceJob
+from profiling import ProfiledRoute, ProfilingMiddleware
+from render import HTMLRenderer
+from readiness import (
+    Readiness,
+    READY_MAX_DB_LATENCY_MS,
+    WARMUP_CONNECTIONS,
+    measure_ms,
+    run_concurrently,
+)
+from singleflight import SingleFlight
+from topology import HashPoolBusy, configure_threadpool, run_in_hash_pool
+from tracing import TracedRoute, TracingMiddleware, create_exporter, span
+
+readiness = Readiness()
+
+# 조회수 증가 등 응답에 필요 없는 쓰기를 모아서 처리
+background_queue = BackgroundQueue()
+
+
+def ping_database():
+    """가장 가벼운 DB 조회"""
+    return get_supabase().table("posts").select("id").limit(1).execute()
+
+
+def warm_up_steps() -> dict:
+    """시작 시 실행할 워밍업 단계"""
+    return {
+        # 커넥션 풀에 연결을 미리 열어둠
+        "connections": lambda: run_concurrently(ping_database, WARMUP_CONNECTIONS),
+        # 최신 게시글 목록 조회 (DB 캐시 및 쿼리 경로 예열)
+        "latest_posts": load_posts,
+        # bcrypt 라이브러리 로드 및 첫 해시 비용 선지불
+        "bcrypt": lambda: check_password("warm-up", hash_password("warm-up")),
+    }
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_threadpool()
+    background_queue.start()
+    readiness.start_warm_up(warm_up_steps())
+    archive_job = None
+    if ARCHIVE_AFTER_DAYS > 0:
+        archive_job = ArchiveJob(
+            get_supabase, ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, ARCHIVE_INTERVAL_SECONDS
+        )
+        archive_job.start()
+    maintenance_job = MaintenanceJob(
+        {
+            "idempotency_keys": idempotency_store.prune,
+            "comment_tombstones": lambda: prune_tombstones(get_supabase()),
+        }
+    )
+    maintenance_job.start()
+    readiness.mark_started(_import_started)
+    yield
+    maintenance_job.stop()
+    if archive_job is not None:
+        archive_job.stop()
+    background_queue.drain()
+
+
+app = FastAPI(title="AI Board API", version="1.0.0", lifespan=lifespan)
+
+
+class InstrumentedRoute(TracedRoute, ProfiledRoute):
+    """트레이싱과 프로파일링 래퍼를 함께 적용한 라우트"""
+
+
+app.router.route_class = InstrumentedRoute
+
+# 동일한 조회 요청이 동시에 몰릴 때 DB 호출을 하나로 합침
+read_flight = SingleFlight()
+
+# 일괄 조회 시 한 번에 요청할 수 있는 최대 게시글 수
+BATCH_MAX_IDS = 50
+
+# 활동순 목록 한 페이지 최대 게시글 수
+ACTIVITY_PAGE_MAX = 50
+
+# 페이지네이션용 전체 개수 캐시
+count_cache = TTLCache(maxsize=4096, ttl=COUNT_CACHE_TTL)
+
+# 등록 API 재시도 시 응답 재생용 저장소 (워커 간 공유는 idempotency_keys 테이블)
+idempotency_store = IdempotencyStore(
+    get_client=(lambda: get_supabase()) if IDEMPOTENCY_SHARED else None
+)
+
+# DB 장애 시 읽기 API가 대신 반환할 마지막 성공 결과 (key -> (저장 시각, 결과))
+last_good_reads = TTLCache(maxsize=STALE_CACHE_SIZE, ttl=STALE_MAX_AGE)
+
+# 게시글 보관 여부 (post_id -> bool). 보관은 되돌리지 않으므로 True는 오래,
+# False는 보관 작업이 옮길 수 있으므로 짧게 유지
+archived_posts = TTLCache(maxsize=10_000, ttl=STALE_MAX_AGE)
+ARCHIVED_FALSE_TTL = 60
 
-app = FastAPI(title="AI Board API", version="1.0.0")
+# 본문 HTML 렌더링 (쓰기 시 저장, 저장된 값이 없는 행만 읽을 때 렌더링)
+html_renderer = HTMLRenderer()
 
 # CORS 설정
 app.add_middleware(
@@ -16,12 +163,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 프로파일링 (PROFILE_SAMPLE_RATE 또는 X-Profile-Token 헤더)
+app.add_middleware(ProfilingMiddleware)
+
+# 요청 트레이싱 (TRACE_EXPORT 설정 시)
+app.add_middleware(TracingMiddleware, exporter=create_exporter())
+
+
+@app.exception_handler(CircuitOpenError)
+def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """DB 회로 차단 중에는 기다리지 않고 바로 503"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database temporarily unavailable"},
+        headers={"Retry-After": str(int(CIRCUIT_OPEN_SECONDS))},
+    )
+
+
+@app.exception_handler(HashPoolBusy)
+def hash_pool_busy_handler(request: Request, exc: HashPoolBusy):
+    """비밀번호 해시 대기열이 차면 요청 스레드를 잡고 기다리지 않고 바로 503"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, try again"},
+        headers={"Retry-After": "1"},
+    )
+
 
 class HealthResponse(BaseModel):
     status: str
     message: str
 
 
+class ReadinessResponse(BaseModel):
+    status: str
+    db_latency_ms: float | None = None
+    startup_ms: float | None = None
+    warmup_ms: float | None = None
+    pool: dict | None = None
+    background: dict | None = None
+    circuit: dict | None = None
+
+
 class Item(BaseModel):
     id: int | None = None
     name: str
@@ -38,6 +221,7 @@ class Post(BaseModel):
     id: int
     title: str
     content: str
+    content_html: str
     author_name: str
     view_count: int
     created_at: str
@@ -57,6 +241,21 @@ class PostUpdate(BaseModel):
     password: str
 
 
+class ActivityPost(Post):
+    comment_count: int
+    last_activity_at: str
+
+
+class ActivityPage(BaseModel):
+    posts: list[ActivityPost]
+    next_cursor: str | None
+
+
+class TotalCount(BaseModel):
+    total: int
+    estimated: bool
+
+
 class PasswordCheck(BaseModel):
     password: str
 
@@ -71,6 +270,7 @@ class Comment(BaseModel):
     post_id: int
     parent_id: int | None
     content: str
+    content_html: str
     author_name: str
     created_at: str
     updated_at: str
@@ -88,12 +288,180 @@ class CommentUpdate(BaseModel):
     password: str
 
 
+class CommentChanges(BaseModel):
+    comments: list[Comment]
+    deleted_ids: list[int]
+    cursor: str
+
+
+def hash_password(password: str) -> str:
+    """비밀번호 bcrypt 해시화"""
+    with span("bcrypt.hash"):
+        return run_in_hash_pool(
+            lambda: bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        )
+
+
+def check_password(password: str, hashed_password: str) -> bool:
+    """비밀번호와 bcrypt 해시 비교"""
+    with span("bcrypt.check"):
+        return run_in_hash_pool(
+            lambda: bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+        )
+
+
+def flush_view_counts(post_ids: list[int]) -> None:
+    """모인 조회수 증가를 게시글별로 합쳐 한 번의 호출로 반영"""
+    increments = Counter(post_ids)
+    get_supabase().rpc(
+        "increment_view_counts",
+        {"post_ids": list(increments), "increments": list(increments.values())},
+    ).execute()
+
+
+background_queue.register("view_count", flush_view_counts)
+
+
+def read_or_stale(key, load, response: Response):
+    """(결과, stale 여부) 반환. DB 조회가 실패하면 마지막 성공 결과를 반환하고 백그라운드에서 갱신"""
+    try:
+        result = load()
+    except Exception as e:
+        # DB 장애일 때만 (코드 오류는 stale 응답으로 가리지 않음)
+        stored = last_good_reads.get(key) if is_unavailable_error(e) else None
+        if stored is None:
+            raise
+        stored_at, result = stored
+        response.headers["Served-Stale"] = "true"
+        response.headers["Age"] = str(int(time.time() - stored_at))
+        background_queue.submit("refresh", (key, load))
+        return result, True
+    last_good_reads.set(key, (time.time(), result))
+    return result, False
+
+
+def refresh_reads(items: list[tuple]) -> None:
+    """stale로 응답한 조회를 다시 실행해 마지막 성공 결과 갱신 (같은 키는 한 번만)"""
+    for key, load in dict(items).items():
+        try:
+            last_good_reads.set(key, (time.time(), load()))
+        except Exception:
+            # 아직 DB 장애 중 (다음 stale 응답 때 다시 시도)
+            continue
+
+
+background_queue.register("refresh", refresh_reads)
+
+
+def remember_archived(post_id: int, archived: bool) -> None:
+    archived_posts.set(post_id, archived, None if archived else ARCHIVED_FALSE_TTL)
+
+
+def is_archived(post_id: int) -> bool:
+    """보관된 게시글인지 (load_post가 확인한 결과가 없을 때만 조회)"""
+    archived = archived_posts.get(post_id)
+    if archived is None:
+        response = read_flight.do(
+            ("archived_id", post_id),
+            lambda: get_supabase()
+            .table("posts_archive")
+            .select("id")
+            .eq("id", post_id)
+            .execute(),
+        )
+        archived = bool(response.data)
+        remember_archived(post_id, archived)
+    return archived
+
+
+def raise_post_not_writable(post_id: int) -> NoReturn:
+    """최근 테이블에 없는 게시글: 보관된(읽기 전용) 게시글이면 409, 아니면 404"""
+    if is_archived(post_id):
+        raise HTTPException(status_code=409, detail="Post is archived (read-only)")
+    raise HTTPException(status_code=404, detail="Post not found")
+
+
+def raise_comment_not_writable(comment_id: int) -> NoReturn:
+    """최근 테이블에 없는 댓글: 보관된(읽기 전용) 댓글이면 409, 아니면 404"""
+    response = (
+        get_supabase().table("comments_archive").select("id").eq("id", comment_id).execute()
+    )
+    if response.data:
+        raise HTTPException(status_code=409, detail="Comment is archived (read-only)")
+    raise HTTPException(status_code=404, detail="Comment not found")
+
+
+def with_content_html(row: dict) -> dict:
+    """content_html이 비어 있는 행(렌더링 도입 전 데이터)은 캐시를 거쳐 채움"""
+    if row.get("content_html") is None:
+        row["content_html"] = html_renderer.render(row["content"])
+    return row
+
+
+def run_idempotent(
+    scope: str, idempotency_key: str | None, payload, response: Response, fn
+):
+    """Idempotency-Key가 있으면 같은 키의 이전 응답을 재생, 없으면 그대로 실행"""
+    if idempotency_key is None:
+        return fn()
+    if len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail="Idempotency-Key is too long")
+
+    try:
+        result, replayed = idempotency_store.run(scope, idempotency_key, payload, fn)
+    except IdempotencyKeyReused:
+        raise HTTPException(
+            status_code=422, detail="Idempotency-Key was used with a different request"
+        )
+    except IdempotencyKeyInProgress:
+        raise HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is in progress",
+            headers={"Retry-After": "1"},
+        )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
 @app.get("/health", response_model=HealthResponse)
 def health_check():
     """헬스 체크 엔드포인트"""
     return HealthResponse(status="ok", message="API is running")
 
 
+@app.get("/ready", response_model=ReadinessResponse)
+def readiness_check(response: Response):
+    """레디니스 체크 엔드포인트 (워밍업 완료 및 DB 응답 시간 확인)"""
+    if not readiness.warmed_up:
+        response.status_code = 503
+        return ReadinessResponse(status="warming_up", startup_ms=readiness.startup_ms)
+
+    try:
+        latency = measure_ms(ping_database)
+    except Exception:
+        response.status_code = 503
+        return ReadinessResponse(
+            status="unavailable",
+            startup_ms=readiness.startup_ms,
+            warmup_ms=readiness.warmup_ms,
+        )
+
+    status = "ok"
+    if latency > READY_MAX_DB_LATENCY_MS:
+        response.status_code = 503
+        status = "degraded"
+    return ReadinessResponse(
+        status=status,
+        db_latency_ms=round(latency, 2),
+        startup_ms=readiness.startup_ms,
+        warmup_ms=readiness.warmup_ms,
+        pool=get_pool_stats(),
+        background=background_queue.stats(),
+        circuit=get_circuit_stats(),
+    )
+
+
 @app.get("/api/items", response_model=list[Item])
 def get_items():
     """모든 아이템 조회"""
@@ -134,52 +502,170 @@ def delete_item(item_id: int):
 
 
 @app.get("/api/posts", response_model=list[Post])
-def get_posts():
-    """게시글 목록 조회 (최신순)"""
+def get_posts(response: Response):
+    """게시글 목록 조회 (최신순, DB 장애 시 마지막 결과)"""
+    posts, _ = read_or_stale("posts", load_posts, response)
+    return posts
+
+
+def load_posts() -> list[dict]:
     supabase = get_supabase()
     response = (
         supabase.table("posts")
-        .select("id, title, content, author_name, view_count, created_at, updated_at")
+        .select("id, title, content, content_html, author_name, view_count, created_at, updated_at")
         .order("created_at", desc=True)
         .execute()
     )
-    return response.data
+    return [with_content_html(post) for post in response.data]
 
 
-@app.get("/api/posts/{post_id}", response_model=Post)
-def get_post(post_id: int):
-    """게시글 상세 조회 (조회수 증가)"""
+@app.get("/api/posts/count", response_model=TotalCount)
+def get_posts_count():
+    """게시글 전체 개수 (큰 테이블은 플래너 추정치, 짧게 캐시)"""
+    cached = count_cache.get("posts")
+    if cached is not None:
+        return cached
+
     supabase = get_supabase()
+    total, estimated = read_flight.do(
+        ("count", "posts"), lambda: count_rows(supabase, "posts")
+    )
+    result = {"total": total, "estimated": estimated}
+    count_cache.set("posts", result)
+    return result
+
+
+def encode_activity_cursor(post: dict) -> str:
+    raw = json.dumps([post["last_activity_at"], post["id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_activity_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        last_activity_at, post_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(last_activity_at).isoformat(), int(post_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@app.get("/api/posts/activity", response_model=ActivityPage)
+def get_posts_by_activity(
+    limit: int = Query(20, ge=1, le=ACTIVITY_PAGE_MAX), cursor: str | None = None
+):
+    """최근 활동(작성, 댓글)순 게시글 목록 (다음 페이지는 next_cursor로 요청)"""
+    before_at, before_id = decode_activity_cursor(cursor) if cursor else (None, None)
+
+    # 다음 페이지 유무 확인용으로 하나 더 조회
     response = (
-        supabase.table("posts")
-        .select("id, title, content, author_name, view_count, created_at, updated_at")
-        .eq("id", post_id)
+        get_supabase()
+        .rpc(
+            "activity_feed",
+            {"before_at": before_at, "before_id": before_id, "page_size": limit + 1},
+        )
         .execute()
     )
-    if not response.data:
-        raise HTTPException(status_code=404, detail="Post not found")
+    posts = [with_content_html(post) for post in response.data[:limit]]
+    next_cursor = encode_activity_cursor(posts[-1]) if len(response.data) > limit else None
+    return {"posts": posts, "next_cursor": next_cursor}
 
-    # 조회수 증가
-    supabase.table("posts").update(
-        {"view_count": response.data[0]["view_count"] + 1}
-    ).eq("id", post_id).execute()
 
-    return response.data[0]
+@app.get("/api/posts/batch", response_model=list[Post])
+def get_posts_batch(ids: list[int] = Query(...)):
+    """게시글 일괄 조회 (요청한 id 순서, 조회수 증가 없음, 없는 id는 생략)"""
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"Too many ids (max {BATCH_MAX_IDS})"
+        )
+
+    supabase = get_supabase()
+    columns = "id, title, content, content_html, author_name, view_count, created_at, updated_at"
+    response = supabase.table("posts").select(columns).in_("id", ids).execute()
+    posts = {post["id"]: post for post in response.data}
+
+    missing = [post_id for post_id in ids if post_id not in posts]
+    if missing:
+        # 보관된 게시글
+        archived = (
+            supabase.table("posts_archive").select(columns).in_("id", missing).execute()
+        )
+        posts.update({post["id"]: post for post in archived.data})
+
+    return [with_content_html(posts[post_id]) for post_id in ids if post_id in posts]
+
+
+@app.get("/api/posts/{post_id}", response_model=Post)
+def get_post(post_id: int, response: Response):
+    """게시글 상세 조회 (조회수 증가, DB 장애 시 마지막 결과)"""
+    (post, archived), stale = read_or_stale(
+        ("post", post_id), lambda: load_post(post_id), response
+    )
+    if not (archived or stale):
+        # 조회수 증가 (응답 후 배치로 반영)
+        background_queue.submit("view_count", post_id)
+    return post
+
+
+def load_post(post_id: int) -> tuple[dict, bool]:
+    """(게시글, 보관 여부) 반환"""
+    supabase = get_supabase()
+    response = read_flight.do(
+        ("post", post_id),
+        lambda: (
+            supabase.table("posts")
+            .select("id, title, content, content_html, author_name, view_count, created_at, updated_at")
+            .eq("id", post_id)
+            .execute()
+        ),
+    )
+    if not response.data:
+        # 보관된 게시글 (읽기 전용)
+        archived = read_flight.do(
+            ("archived_post", post_id),
+            lambda: (
+                supabase.table("posts_archive")
+                .select("id, title, content, content_html, author_name, view_count, created_at, updated_at")
+                .eq("id", post_id)
+                .execute()
+            ),
+        )
+        if not archived.data:
+            raise HTTPException(status_code=404, detail="Post not found")
+        remember_archived(post_id, True)
+        return with_content_html(archived.data[0]), True
+    remember_archived(post_id, False)
+    return with_content_html(response.data[0]), False
 
 
 @app.post("/api/posts", response_model=Post, status_code=201)
-def create_post(post: PostCreate):
-    """게시글 등록"""
+def create_post(
+    post: PostCreate,
+    response: Response,
+    idempotency_key: str | None = Header(None),
+):
+    """게시글 등록 (Idempotency-Key 헤더가 같으면 이전 응답 재생)"""
+    # 비밀번호 원문이 요청 해시(idempotency_keys.request_hash)에 들어가지 않도록 제외
+    return run_idempotent(
+        "posts",
+        idempotency_key,
+        post.model_dump(exclude={"password"}),
+        response,
+        lambda: insert_post(post),
+    )
+
+
+def insert_post(post: PostCreate) -> dict:
+    """게시글 저장"""
+    fail_fast_if_circuit_open()
     supabase = get_supabase()
 
     # 비밀번호 해시화
-    hashed_password = bcrypt.hashpw(
-        post.password.encode("utf-8"), bcrypt.gensalt()
-    ).decode("utf-8")
+    hashed_password = hash_password(post.password)
 
     data = {
         "title": post.title,
         "content": post.content,
+        "content_html": html_renderer.render(post.content),
         "author_name": post.author_name,
         "password": hashed_password,
     }
@@ -192,6 +678,7 @@ def create_post(post: PostCreate):
         "id": result["id"],
         "title": result["title"],
         "content": result["content"],
+        "content_html": data["content_html"],
         "author_name": result["author_name"],
         "view_count": result["view_count"],
         "created_at": result["created_at"],
@@ -202,23 +689,24 @@ def create_post(post: PostCreate):
 @app.put("/api/posts/{post_id}", response_model=Post)
 def update_post(post_id: int, post: PostUpdate):
     """게시글 수정"""
+    fail_fast_if_circuit_open()
     supabase = get_supabase()
 
     # 기존 게시글 조회 (비밀번호 포함)
     response = supabase.table("posts").select("id, password").eq("id", post_id).execute()
     if not response.data:
-        raise HTTPException(status_code=404, detail="Post not found")
+        raise_post_not_writable(post_id)
 
     # 비밀번호 확인
     stored_password = response.data[0]["password"]
-    if not bcrypt.checkpw(post.password.encode("utf-8"), stored_password.encode("utf-8")):
+    if not check_password(post.password, stored_password):
         raise HTTPException(status_code=403, detail="Invalid password")
 
     # 게시글 수정
     update_data = {
         "title": post.title,
         "content": post.content,
-        "updated_at": datetime.now().isoformat(),
+        "content_html": html_renderer.render(post.content),
     }
     update_response = (
         supabase.table("posts").update(update_data).eq("id", post_id).execute()
@@ -229,6 +717,7 @@ def update_post(post_id: int, post: PostUpdate):
         "id": result["id"],
         "title": result["title"],
         "content": result["content"],
+        "content_html": update_data["content_html"],
         "author_name": result["author_name"],
         "view_count": result["view_count"],
         "created_at": result["created_at"],
@@ -239,16 +728,17 @@ def update_post(post_id: int, post: PostUpdate):
 @app.delete("/api/posts/{post_id}", status_code=204)
 def delete_post(post_id: int, body: PasswordCheck = Body(...)):
     """게시글 삭제"""
+    fail_fast_if_circuit_open()
     supabase = get_supabase()
 
     # 기존 게시글 조회 (비밀번호 포함)
     response = supabase.table("posts").select("id, password").eq("id", post_id).execute()
     if not response.data:
-        raise HTTPException(status_code=404, detail="Post not found")
+        raise_post_not_writable(post_id)
 
     # 비밀번호 확인
     stored_password = response.data[0]["password"]
-    if not bcrypt.checkpw(body.password.encode("utf-8"), stored_password.encode("utf-8")):
+    if not check_password(body.password, stored_password):
         raise HTTPException(status_code=403, detail="Invalid password")
 
     # 게시글 삭제
@@ -263,10 +753,10 @@ def verify_post_password(post_id: int, body: PasswordCheck):
 
     response = supabase.table("posts").select("id, password").eq("id", post_id).execute()
     if not response.data:
-        raise HTTPException(status_code=404, detail="Post not found")
+        raise_post_not_writable(post_id)
 
     stored_password = response.data[0]["password"]
-    is_valid = bcrypt.checkpw(body.password.encode("utf-8"), stored_password.encode("utf-8"))
+    is_valid = check_password(body.password, stored_password)
 
     return {"valid": is_valid}
 
@@ -275,38 +765,138 @@ def verify_post_password(post_id: int, body: PasswordCheck):
 
 
 @app.get("/api/posts/{post_id}/comments", response_model=list[Comment])
-def get_comments(post_id: int):
-    """게시글의 댓글 목록 조회 (생성순)"""
+def get_comments(post_id: int, response: Response):
+    """게시글의 댓글 목록 조회 (생성순, DB 장애 시 마지막 결과)"""
+    comments, _ = read_or_stale(
+        ("comments", post_id), lambda: load_comments(post_id), response
+    )
+    return comments
+
+
+def load_comments(post_id: int) -> list[dict]:
     supabase = get_supabase()
-    response = (
-        supabase.table("comments")
-        .select("id, post_id, parent_id, content, author_name, created_at, updated_at")
+
+    def fetch(table: str):
+        return read_flight.do(
+            (table, post_id),
+            lambda: (
+                supabase.table(table)
+                .select("id, post_id, parent_id, content, content_html, author_name, created_at, updated_at")
+                .eq("post_id", post_id)
+                .order("created_at", desc=False)
+                .execute()
+            ),
+        )
+
+    response = fetch("comments")
+    if not response.data and is_archived(post_id):
+        # 보관된 게시글의 댓글
+        response = fetch("comments_archive")
+    return [with_content_html(comment) for comment in response.data]
+
+
+@app.get("/api/posts/{post_id}/comments/changes", response_model=CommentChanges)
+def get_comment_changes(post_id: int, since: datetime):
+    """since 이후 생성/수정된 댓글과 삭제된 댓글 id (다음 요청에는 cursor를 since로 사용)"""
+    try:
+        since = check_since(since)
+    except SyncWindowExpired:
+        raise HTTPException(
+            status_code=410, detail="since is too old, reload all comments"
+        )
+    supabase = get_supabase()
+
+    def fetch_changed(table: str):
+        return (
+            supabase.table(table)
+            .select("id, post_id, parent_id, content, content_html, author_name, created_at, updated_at")
+            .eq("post_id", post_id)
+            .gte("updated_at", since.isoformat())
+            .order("updated_at", desc=False)
+            .execute()
+        )
+
+    changed = fetch_changed("comments")
+    if not changed.data and is_archived(post_id):
+        # 보관된 게시글의 댓글 (보관 후에는 바뀌지 않음)
+        changed = fetch_changed("comments_archive")
+    deleted = (
+        supabase.table("comment_tombstones")
+        .select("comment_id, deleted_at")
         .eq("post_id", post_id)
-        .order("created_at", desc=False)
+        .gte("deleted_at", since.isoformat())
         .execute()
     )
-    return response.data
+
+    # 경계 시각과 margin 안의 행은 다음 응답에도 올 수 있음 (클라이언트는 id 기준으로 덮어씀)
+    cursor = next_cursor(
+        since,
+        [datetime.fromisoformat(c["updated_at"]) for c in changed.data]
+        + [datetime.fromisoformat(d["deleted_at"]) for d in deleted.data],
+        now=lambda: database_now(supabase),
+    )
+    return {
+        "comments": [with_content_html(comment) for comment in changed.data],
+        "deleted_ids": [d["comment_id"] for d in deleted.data],
+        "cursor": cursor.isoformat(),
+    }
+
+
+@app.get("/api/posts/{post_id}/comments/count", response_model=TotalCount)
+def get_comments_count(post_id: int):
+    """게시글의 댓글 개수 (트리거로 유지되는 comment_count, 짧게 캐시)"""
+    cached = count_cache.get(("comments", post_id))
+    if cached is not None:
+        return cached
+
+    supabase = get_supabase()
+    for table in ("posts", "posts_archive"):
+        response = supabase.table(table).select("comment_count").eq("id", post_id).execute()
+        if response.data:
+            break
+    else:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    result = {"total": response.data[0]["comment_count"], "estimated": False}
+    count_cache.set(("comments", post_id), result)
+    return result
 
 
 @app.post("/api/posts/{post_id}/comments", response_model=Comment, status_code=201)
-def create_comment(post_id: int, comment: CommentCreate):
-    """댓글/대댓글 등록"""
+def create_comment(
+    post_id: int,
+    comment: CommentCreate,
+    response: Response,
+    idempotency_key: str | None = Header(None),
+):
+    """댓글/대댓글 등록 (Idempotency-Key 헤더가 같으면 이전 응답 재생)"""
+    return run_idempotent(
+        f"posts/{post_id}/comments",
+        idempotency_key,
+        comment.model_dump(exclude={"password"}),  # 비밀번호 원문은 요청 해시에서 제외
+        response,
+        lambda: insert_comment(post_id, comment),
+    )
+
+
+def insert_comment(post_id: int, comment: CommentCreate) -> dict:
+    """댓글/대댓글 저장"""
+    fail_fast_if_circuit_open()
     supabase = get_supabase()
 
     # 게시글 존재 확인
     post_response = supabase.table("posts").select("id").eq("id", post_id).execute()
     if not post_response.data:
-        raise HTTPException(status_code=404, detail="Post not found")
+        raise_post_not_writable(post_id)
 
     # 비밀번호 해시화
-    hashed_password = bcrypt.hashpw(
-        comment.password.encode("utf-8"), bcrypt.gensalt()
-    ).decode("utf-8")
+    hashed_password = hash_password(comment.password)
 
     data = {
         "post_id": post_id,
         "parent_id": comment.parent_id,
         "content": comment.content,
+        "content_html": html_renderer.render(comment.content),
         "author_name": comment.author_name,
         "password": hashed_password,
     }
@@ -319,6 +909,7 @@ def create_comment(post_id: int, comment: CommentCreate):
         "post_id": result["post_id"],
         "parent_id": result["parent_id"],
         "content": result["content"],
+        "content_html": data["content_html"],
         "author_name": result["author_name"],
         "created_at": result["created_at"],
         "updated_at": result["updated_at"],
@@ -328,6 +919,7 @@ def create_comment(post_id: int, comment: CommentCreate):
 @app.put("/api/comments/{comment_id}", response_model=Comment)
 def update_comment(comment_id: int, comment: CommentUpdate):
     """댓글 수정"""
+    fail_fast_if_circuit_open()
     supabase = get_supabase()
 
     # 기존 댓글 조회 (비밀번호 포함)
@@ -335,19 +927,17 @@ def update_comment(comment_id: int, comment: CommentUpdate):
         supabase.table("comments").select("id, password").eq("id", comment_id).execute()
     )
     if not response.data:
-        raise HTTPException(status_code=404, detail="Comment not found")
+        raise_comment_not_writable(comment_id)
 
     # 비밀번호 확인
     stored_password = response.data[0]["password"]
-    if not bcrypt.checkpw(
-        comment.password.encode("utf-8"), stored_password.encode("utf-8")
-    ):
+    if not check_password(comment.password, stored_password):
         raise HTTPException(status_code=403, detail="Invalid password")
 
     # 댓글 수정
     update_data = {
         "content": comment.content,
-        "updated_at": datetime.now().isoformat(),
+        "content_html": html_renderer.render(comment.content),
     }
     update_response = (
         supabase.table("comments").update(update_data).eq("id", comment_id).execute()
@@ -359,6 +949,7 @@ def update_comment(comment_id: int, comment: CommentUpdate):
         "post_id": result["post_id"],
         "parent_id": result["parent_id"],
         "content": result["content"],
+        "content_html": update_data["content_html"],
         "author_name": result["author_name"],
         "created_at": result["created_at"],
         "updated_at": result["updated_at"],
@@ -368,6 +959,7 @@ def update_comment(comment_id: int, comment: CommentUpdate):
 @app.delete("/api/comments/{comment_id}", status_code=204)
 def delete_comment(comment_id: int, body: PasswordCheck = Body(...)):
     """댓글 삭제"""
+    fail_fast_if_circuit_open()
     supabase = get_supabase()
 
     # 기존 댓글 조회 (비밀번호 포함)
@@ -375,11 +967,11 @@ def delete_comment(comment_id: int, body: PasswordCheck = Body(...)):
         supabase.table("comments").select("id, password").eq("id", comment_id).execute()
     )
     if not response.data:
-        raise HTTPException(status_code=404, detail="Comment not found")
+        raise_comment_not_writable(comment_id)
 
     # 비밀번호 확인
     stored_password = response.data[0]["password"]
-    if not bcrypt.checkpw(body.password.encode("utf-8"), stored_password.encode("utf-8")):
+    if not check_password(body.password, stored_password):
         raise HTTPException(status_code=403, detail="Invalid password")
 
     # 댓글 삭제 (대댓글도 cascade로 삭제됨)
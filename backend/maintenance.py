@@ -0,0 +1,47 @@
+import logging
+import os
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# 만료된 기록(Idempotency-Key 등) 정리 주기(초)
+MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("MAINTENANCE_INTERVAL_SECONDS", "3600"))
+
+
+class MaintenanceJob:
+    """주기적으로 정리 작업(삭제한 행 수 반환)을 실행하는 백그라운드 작업"""
+
+    def __init__(
+        self,
+        tasks: dict[str, Callable[[], int]],
+        interval: float = MAINTENANCE_INTERVAL_SECONDS,
+    ):
+        self.tasks = tasks
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> dict[str, int]:
+        """작업을 모두 실행 (실패해도 다음 작업 진행)"""
+        results = {}
+        for name, task in self.tasks.items():
+            try:
+                results[name] = task()
+            except Exception as e:
+                logger.warning("Maintenance task %s failed: %s", name, e)
+                continue
+            if results[name]:
+                logger.info("Maintenance task %s removed %d rows", name, results[name])
+        return results
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
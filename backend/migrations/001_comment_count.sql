@@ -0,0 +1,34 @@
+-- 기존 DB에 posts.comment_count 추가 (schema.sql로 새로 만든 DB는 실행하지 않음)
+-- 댓글 INSERT/DELETE를 막은 채 집계해 트리거가 생기기 전의 변경을 놓치지 않음
+
+BEGIN;
+
+LOCK TABLE comments IN SHARE MODE;
+
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS comment_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE IF EXISTS posts_archive ADD COLUMN IF NOT EXISTS comment_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE posts p
+SET comment_count = c.total
+FROM (SELECT post_id, count(*) AS total FROM comments GROUP BY post_id) c
+WHERE p.id = c.post_id;
+
+-- 게시글별 댓글 수 유지 (count(*) 없이 O(1) 조회)
+CREATE OR REPLACE FUNCTION update_post_comment_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE posts SET comment_count = comment_count + 1 WHERE id = NEW.post_id;
+    ELSE
+        UPDATE posts SET comment_count = comment_count - 1 WHERE id = OLD.post_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_comments_count ON comments;
+CREATE TRIGGER trg_comments_count
+AFTER INSERT OR DELETE ON comments
+FOR EACH ROW EXECUTE FUNCTION update_post_comment_count();
+
+COMMIT;
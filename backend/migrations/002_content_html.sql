@@ -0,0 +1,7 @@
+-- 기존 DB에 렌더링한 HTML 컬럼 추가
+-- 기존 행은 NULL로 두면 읽을 때 렌더링하므로 채우지 않음
+
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS content_html TEXT;
+ALTER TABLE comments ADD COLUMN IF NOT EXISTS content_html TEXT;
+ALTER TABLE IF EXISTS posts_archive ADD COLUMN IF NOT EXISTS content_html TEXT;
+ALTER TABLE IF EXISTS comments_archive ADD COLUMN IF NOT EXISTS content_html TEXT;
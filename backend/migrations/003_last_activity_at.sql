@@ -0,0 +1,56 @@
+-- 기존 DB에 posts.last_activity_at 추가 (001_comment_count.sql 다음에 실행)
+-- 기본값 NOW()로 바로 추가하면 모든 기존 게시글이 방금 활동한 것처럼 보이므로
+-- NULL 허용으로 추가해 작성 시각과 마지막 댓글 시각으로 채운 뒤 NOT NULL로 바꿈
+
+BEGIN;
+
+LOCK TABLE comments IN SHARE MODE;
+
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS last_activity_at TIMESTAMP WITH TIME ZONE;
+
+-- 마지막 댓글 시각은 idx_comments_post_id_created_at으로 게시글마다 한 번에 찾음
+UPDATE posts p
+SET last_activity_at = COALESCE(
+    GREATEST(p.created_at, (SELECT max(c.created_at) FROM comments c WHERE c.post_id = p.id)),
+    NOW()
+)
+WHERE p.last_activity_at IS NULL;
+
+ALTER TABLE posts ALTER COLUMN last_activity_at SET DEFAULT NOW();
+ALTER TABLE posts ALTER COLUMN last_activity_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_posts_last_activity ON posts(last_activity_at DESC, id DESC);
+
+-- 게시글별 댓글 수와 마지막 활동 시각 유지 (count(*)/max() 없이 O(1) 조회)
+CREATE OR REPLACE FUNCTION update_post_comment_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE posts
+        SET comment_count = comment_count + 1,
+            last_activity_at = GREATEST(last_activity_at, NEW.created_at)
+        WHERE id = NEW.post_id;
+    ELSE
+        UPDATE posts SET comment_count = comment_count - 1 WHERE id = OLD.post_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 보관된 게시글도 같은 기준으로 채움
+ALTER TABLE IF EXISTS posts_archive ADD COLUMN IF NOT EXISTS last_activity_at TIMESTAMP WITH TIME ZONE;
+
+DO $$
+BEGIN
+    IF to_regclass('posts_archive') IS NOT NULL AND to_regclass('comments_archive') IS NOT NULL THEN
+        UPDATE posts_archive p
+        SET last_activity_at = GREATEST(
+            p.created_at,
+            (SELECT max(c.created_at) FROM comments_archive c WHERE c.post_id = p.id)
+        )
+        WHERE p.last_activity_at IS NULL;
+    END IF;
+END;
+$$;
+
+COMMIT;
@@ -0,0 +1,315 @@
+"""PostgreSQL 직접 연결 백엔드 (DB_BACKEND=postgres)
+
+main.py가 사용하는 supabase 쿼리 빌더 호출(table/select/eq/order/execute 등)을
+같은 모양의 SQL로 옮겨 psycopg 커넥션 풀에서 실행한다. 쿼리 모양이 같으면
+SQL 문자열도 같으므로 서버 측 prepared statement가 재사용된다.
+"""
+
+import re
+import time
+from datetime import date, datetime
+from typing import Any
+
+from psycopg import OperationalError, sql
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool, PoolTimeout
+
+from circuit import CircuitBreaker
+from tracing import span
+
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+def _identifier(name: str) -> sql.Identifier:
+    name = name.strip()
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return sql.Identifier(name)
+
+
+def _serialize(row: dict) -> dict:
+    """PostgREST 응답과 같도록 날짜/시간 값을 ISO 문자열로 변환"""
+    return {
+        key: value.isoformat() if isinstance(value, (datetime, date)) else value
+        for key, value in row.items()
+    }
+
+
+class QueryResponse:
+    """supabase APIResponse와 같은 모양의 결과"""
+
+    def __init__(self, data: list[dict], count: int | None = None):
+        self.data = data
+        self.count = count
+
+
+class PostgresQuery:
+    """supabase 쿼리 빌더 호환 SQL 빌더"""
+
+    def __init__(self, client: "PostgresClient", table: str):
+        self._client = client
+        self._table_name = table
+        self._table = _identifier(table)
+        self._action = "select"
+        self._columns: list[str] = ["*"]
+        self._values: dict | list[dict] | None = None
+        self._filters: list[tuple[sql.Composable, list]] = []
+        self._order: list[sql.Composable] = []
+        self._limit: int | None = None
+        self._count: str | None = None
+        self._head = False
+
+    # === 동작 ===
+    def select(
+        self, *columns: str, count: str | None = None, head: bool | None = None
+    ) -> "PostgresQuery":
+        self._action = "select"
+        self._columns = [c.strip() for c in ",".join(columns or ("*",)).split(",")]
+        self._count = count
+        self._head = bool(head)
+        return self
+
+    def insert(self, data: dict | list[dict]) -> "PostgresQuery":
+        self._action = "insert"
+        self._values = data
+        return self
+
+    def update(self, data: dict) -> "PostgresQuery":
+        self._action = "update"
+        self._values = data
+        return self
+
+    def delete(self) -> "PostgresQuery":
+        self._action = "delete"
+        return self
+
+    # === 필터/정렬 ===
+    def _filter(self, column: str, op: str, value: Any) -> "PostgresQuery":
+        clause = sql.SQL("{} {} %s").format(_identifier(column), sql.SQL(op))
+        self._filters.append((clause, [value]))
+        return self
+
+    def eq(self, column: str, value: Any) -> "PostgresQuery":
+        return self._filter(column, "=", value)
+
+    def neq(self, column: str, value: Any) -> "PostgresQuery":
+        return self._filter(column, "<>", value)
+
+    def gt(self, column: str, value: Any) -> "PostgresQuery":
+        return self._filter(column, ">", value)
+
+    def gte(self, column: str, value: Any) -> "PostgresQuery":
+        return self._filter(column, ">=", value)
+
+    def lt(self, column: str, value: Any) -> "PostgresQuery":
+        return self._filter(column, "<", value)
+
+    def lte(self, column: str, value: Any) -> "PostgresQuery":
+        return self._filter(column, "<=", value)
+
+    def in_(self, column: str, values: list) -> "PostgresQuery":
+        # = ANY(%s) 형태로 두면 값 개수와 무관하게 같은 prepared statement 사용
+        clause = sql.SQL("{} = ANY(%s)").format(_identifier(column))
+        self._filters.append((clause, [list(values)]))
+        return self
+
+    def is_(self, column: str, value: Any) -> "PostgresQuery":
+        if value not in (None, "null"):
+            raise ValueError("is_ only supports null")
+        self._filters.append((sql.SQL("{} IS NULL").format(_identifier(column)), []))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "PostgresQuery":
+        direction = sql.SQL("DESC") if desc else sql.SQL("ASC")
+        self._order.append(sql.SQL("{} {}").format(_identifier(column), direction))
+        return self
+
+    def limit(self, size: int) -> "PostgresQuery":
+        self._limit = size
+        return self
+
+    # === SQL 생성 ===
+    def _column_list(self) -> sql.Composable:
+        if self._columns == ["*"]:
+            return sql.SQL("*")
+        return sql.SQL(", ").join(_identifier(c) for c in self._columns)
+
+    def _where(self, params: list) -> sql.Composable:
+        if not self._filters:
+            return sql.SQL("")
+        clauses = []
+        for clause, values in self._filters:
+            clauses.append(clause)
+            params.extend(values)
+        return sql.SQL(" WHERE ") + sql.SQL(" AND ").join(clauses)
+
+    def build(self) -> tuple[sql.Composable, list]:
+        """실행할 SQL과 파라미터 반환"""
+        params: list = []
+
+        if self._action == "insert":
+            rows = self._values if isinstance(self._values, list) else [self._values]
+            columns = list(rows[0].keys())
+            placeholders = sql.SQL("({})").format(
+                sql.SQL(", ").join([sql.Placeholder()] * len(columns))
+            )
+            query = sql.SQL("INSERT INTO {} ({}) VALUES {} RETURNING *").format(
+                self._table,
+                sql.SQL(", ").join(_identifier(c) for c in columns),
+                sql.SQL(", ").join([placeholders] * len(rows)),
+            )
+            for row in rows:
+                params.extend(row[c] for c in columns)
+            return query, params
+
+        if self._action == "update":
+            columns = list(self._values.keys())
+            params.extend(self._values[c] for c in columns)
+            query = sql.SQL("UPDATE {} SET {}").format(
+                self._table,
+                sql.SQL(", ").join(
+                    sql.SQL("{} = %s").format(_identifier(c)) for c in columns
+                ),
+            )
+            return query + self._where(params) + sql.SQL(" RETURNING *"), params
+
+        if self._action == "delete":
+            query = sql.SQL("DELETE FROM {}").format(self._table)
+            return query + self._where(params) + sql.SQL(" RETURNING *"), params
+
+        query = sql.SQL("SELECT {} FROM {}").format(self._column_list(), self._table)
+        query += self._where(params)
+        if self._order:
+            query += sql.SQL(" ORDER BY ") + sql.SQL(", ").join(self._order)
+        if self._limit is not None:
+            query += sql.SQL(" LIMIT %s")
+            params.append(self._limit)
+        return query, params
+
+    def build_count(self) -> tuple[sql.Composable, list]:
+        """count 옵션에 맞는 행 수 SQL (exact: count(*), planned/estimated: EXPLAIN)"""
+        params: list = []
+        where = self._where(params)
+        if self._count == "exact":
+            query = sql.SQL("SELECT count(*) AS count FROM {}").format(self._table)
+        else:
+            query = sql.SQL("EXPLAIN (FORMAT JSON) SELECT 1 FROM {}").format(self._table)
+        return query + where, params
+
+    def _fetch_count(self) -> int:
+        query, params = self.build_count()
+        rows = self._client.fetch(query, params)
+        if self._count == "exact":
+            return rows[0]["count"]
+        return int(rows[0]["QUERY PLAN"][0]["Plan"]["Plan Rows"])
+
+    def execute(self) -> QueryResponse:
+        if self._action == "select" and self._count:
+            attributes = {"db.operation": "count", "db.table": self._table_name}
+            with span("postgres", **attributes):
+                count = self._fetch_count()
+            if self._head:
+                return QueryResponse([], count)
+        else:
+            count = None
+
+        query, params = self.build()
+        with span(
+            "postgres",
+            **{
+                "db.operation": self._action,
+                "db.table": self._table_name,
+                "db.filter": ", ".join(c.as_string(None) for c, _ in self._filters),
+            },
+        ):
+            return QueryResponse(self._client.fetch(query, params), count)
+
+
+class PostgresRPC:
+    """스칼라 값을 반환하는 함수 호출 (supabase rpc() 호환)"""
+
+    def __init__(self, client: "PostgresClient", fn: str, params: dict):
+        self._client = client
+        self._fn = _identifier(fn)
+        self._params = params
+
+    def build(self) -> tuple[sql.Composable, list]:
+        args = sql.SQL(", ").join(
+            sql.SQL("{} => %s").format(_identifier(name)) for name in self._params
+        )
+        query = sql.SQL("SELECT {}({}) AS result").format(self._fn, args)
+        return query, list(self._params.values())
+
+    def execute(self) -> QueryResponse:
+        query, params = self.build()
+        function = self._fn.as_string(None)
+        with span("postgres", **{"db.operation": "rpc", "db.function": function}):
+            rows = self._client.fetch(query, params)
+        return QueryResponse(rows[0]["result"] if rows else None)
+
+
+class PostgresClient:
+    """psycopg 커넥션 풀 기반 클라이언트 (supabase Client의 table() 호환)"""
+
+    def __init__(
+        self,
+        conninfo: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        prepare_threshold: int | None = 0,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.breaker = breaker
+        # prepare_threshold=0: 첫 실행부터 prepared statement 사용
+        # (PgBouncer transaction 모드 등에서는 None으로 비활성화)
+        self.pool = ConnectionPool(
+            conninfo,
+            min_size=min_size,
+            max_size=max_size,
+            kwargs={
+                "autocommit": True,
+                "row_factory": dict_row,
+                "prepare_threshold": prepare_threshold,
+            },
+            open=True,
+        )
+
+    def table(self, table_name: str) -> PostgresQuery:
+        return PostgresQuery(self, table_name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: dict | None = None) -> PostgresRPC:
+        return PostgresRPC(self, fn, params or {})
+
+    def fetch(self, query: sql.Composable, params: list) -> list[dict]:
+        if self.breaker is None:
+            return self._fetch(query, params)
+
+        # 연결 오류/풀 대기 초과와 느린 쿼리만 실패로 기록 (제약 조건 위반 등은 정상 응답)
+        self.breaker.before_call()
+        started = time.perf_counter()
+        try:
+            rows = self._fetch(query, params)
+        except (OperationalError, PoolTimeout):
+            self.breaker.record(False, (time.perf_counter() - started) * 1000)
+            raise
+        except Exception:
+            self.breaker.record(True, (time.perf_counter() - started) * 1000)
+            raise
+        self.breaker.record(True, (time.perf_counter() - started) * 1000)
+        return rows
+
+    def _fetch(self, query: sql.Composable, params: list) -> list[dict]:
+        with self.pool.connection() as conn:
+            cur = conn.execute(query, params)
+            if cur.description is None:
+                return []
+            return [_serialize(row) for row in cur.fetchall()]
+
+    def stats(self) -> dict:
+        """풀 사용 현황 (psycopg_pool 통계)"""
+        return self.pool.get_stats()
+
+    def close(self) -> None:
+        self.pool.close()
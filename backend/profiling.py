@@ -0,0 +1,234 @@
+import cProfile
+import functools
+import hmac
+import inspect
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+
+from fastapi.routing import APIRoute
+
+# 샘플링할 요청 비율 (0 ~ 1, 기본은 비활성)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# 이 값과 같은 X-Profile-Token 헤더가 있으면 항상 프로파일링
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# cprofile: .prof (snakeviz, flameprof 등) / sample: .folded (flamegraph.pl, speedscope)
+PROFILE_MODE = os.getenv("PROFILE_MODE", "cprofile")
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.001"))
+
+PROFILE_HEADER = b"x-profile-token"
+
+logger = logging.getLogger(__name__)
+
+# 프로세스당 프로파일러는 하나만 (3.12+에서 cProfile을 동시에 켜면 ValueError이고,
+# 켜져 있는 동안 모든 스레드의 호출을 수집함)
+_profile_lock = threading.Lock()
+
+current_profiler: ContextVar["RequestProfiler | None"] = ContextVar(
+    "current_profiler", default=None
+)
+
+
+class RequestProfiler(ABC):
+    """요청 하나에 대한 프로파일러 (핸들러 실행 스레드에서 enable/disable)"""
+
+    suffix = ""
+
+    @abstractmethod
+    def enable(self) -> None: ...
+
+    @abstractmethod
+    def disable(self) -> None: ...
+
+    @abstractmethod
+    def dump(self, path: Path) -> None: ...
+
+
+class CProfileProfiler(RequestProfiler):
+    """결정적 프로파일러 (cProfile)"""
+
+    suffix = ".prof"
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def enable(self) -> None:
+        self.profile.enable()
+
+    def disable(self) -> None:
+        self.profile.disable()
+
+    def dump(self, path: Path) -> None:
+        self.profile.dump_stats(path)
+
+
+class SamplingProfiler(RequestProfiler):
+    """통계적 프로파일러: 대상 스레드의 스택을 주기적으로 수집해 collapsed stack 생성"""
+
+    suffix = ".folded"
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sample(self, thread_id: int) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                filename = Path(code.co_filename).name
+                stack.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def enable(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._sample, args=(threading.get_ident(),), daemon=True
+        )
+        self._thread.start()
+
+    def disable(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def dump(self, path: Path) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _start(profiler: RequestProfiler) -> bool:
+    try:
+        profiler.enable()
+    except Exception:
+        # 프로파일링 실패가 요청을 실패시키지 않도록 함
+        logger.exception("Failed to start profiler")
+        return False
+    return True
+
+
+def _stop(profiler: RequestProfiler) -> None:
+    try:
+        profiler.disable()
+    except Exception:
+        logger.exception("Failed to stop profiler")
+
+
+def profiled(endpoint):
+    """현재 요청이 프로파일 대상이면 핸들러 실행 구간을 프로파일링"""
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            profiler = current_profiler.get()
+            if profiler is None or not _start(profiler):
+                return await endpoint(*args, **kwargs)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _stop(profiler)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        # sync 핸들러는 스레드풀에서 실행되므로 그 스레드에서 프로파일러를 켬
+        profiler = current_profiler.get()
+        if profiler is None or not _start(profiler):
+            return endpoint(*args, **kwargs)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            _stop(profiler)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """엔드포인트를 profiled()로 감싸는 라우트 클래스"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, profiled(endpoint), **kwargs)
+
+
+class ProfilingMiddleware:
+    """샘플링되었거나 인가된 헤더가 있는 요청을 프로파일링해 파일로 저장"""
+
+    def __init__(
+        self,
+        app,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        token: str | None = PROFILE_TOKEN,
+        output_dir: str = PROFILE_DIR,
+        mode: str = PROFILE_MODE,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.token = token.encode() if token else None
+        self.output_dir = Path(output_dir)
+        self.mode = mode
+
+    def _should_profile(self, scope) -> bool:
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER and hmac.compare_digest(value, self.token):
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _new_profiler(self) -> RequestProfiler:
+        if self.mode == "sample":
+            return SamplingProfiler(PROFILE_SAMPLE_INTERVAL)
+        return CProfileProfiler()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # 다른 요청을 프로파일링 중이면 기다리지 않고 건너뜀
+        if not _profile_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            profiler = self._new_profiler()
+            reset_token = current_profiler.set(profiler)
+            started = time.perf_counter()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                current_profiler.reset(reset_token)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                try:
+                    self._write(profiler, scope, elapsed_ms)
+                except Exception:
+                    logger.exception("Failed to write profile")
+        finally:
+            _profile_lock.release()
+
+    def _write(self, profiler: RequestProfiler, scope, elapsed_ms: float) -> None:
+        route = scope.get("route")
+        path = route.path if route is not None else scope["path"]
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+        filename = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{slug}"
+            f"-{elapsed_ms:.0f}ms-{uuid.uuid4().hex[:6]}{profiler.suffix}"
+        )
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        profiler.dump(self.output_dir / filename)
@@ -0,0 +1,75 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# DB 응답이 이 시간(ms)을 넘으면 준비되지 않은 것으로 판단
+READY_MAX_DB_LATENCY_MS = float(os.getenv("READY_MAX_DB_LATENCY_MS", "500"))
+# 워밍업 때 미리 열어둘 DB 연결 수
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", "4"))
+
+
+class Readiness:
+    """시작 워밍업 진행 상태와 의존성 점검"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.warmed_up = False
+        self.startup_ms: float | None = None
+        self.warmup_ms: float | None = None
+        self.warmup_errors: list[str] = []
+
+    def mark_started(self, started: float) -> None:
+        """프로세스 시작(main import)부터 요청을 받을 수 있을 때까지 걸린 시간 기록"""
+        self.startup_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info("Started in %.1fms", self.startup_ms)
+
+    def run_warm_up(self, steps: dict[str, Callable[[], object]]) -> None:
+        """워밍업 단계를 순서대로 실행 (실패해도 다음 단계 진행)"""
+        started = time.perf_counter()
+        errors = []
+        for name, step in steps.items():
+            step_started = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                logger.warning("Warm-up step %s failed: %s", name, e)
+                errors.append(f"{name}: {e}")
+            else:
+                logger.info(
+                    "Warm-up step %s took %.1fms",
+                    name,
+                    (time.perf_counter() - step_started) * 1000,
+                )
+        with self._lock:
+            self.warmup_errors = errors
+            self.warmup_ms = (time.perf_counter() - started) * 1000
+            self.warmed_up = True
+
+    def start_warm_up(self, steps: dict[str, Callable[[], object]]) -> threading.Thread:
+        """백그라운드 스레드에서 워밍업 시작"""
+        thread = threading.Thread(
+            target=self.run_warm_up, args=(steps,), name="warm-up", daemon=True
+        )
+        thread.start()
+        return thread
+
+
+def measure_ms(fn: Callable[[], object]) -> float:
+    """fn 실행 시간(ms)"""
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def run_concurrently(fn: Callable[[], object], count: int) -> None:
+    """fn을 count개 동시에 실행 (커넥션 풀에 연결을 미리 열어두기 위함)"""
+    if count <= 0:
+        return
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        for future in [executor.submit(fn) for _ in range(count)]:
+            future.result()
@@ -0,0 +1,60 @@
+import hashlib
+import html
+import os
+import re
+
+from cache import TTLCache
+
+RENDER_CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", "10000"))
+RENDER_CACHE_TTL = float(os.getenv("RENDER_CACHE_TTL", "3600"))
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"']+")
+# 문장 끝 문장부호는 링크에 포함하지 않음
+URL_TRAILING = ".,;:!?)]}"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _linkify(line: str) -> str:
+    """한 줄을 escape하고 URL만 링크로 감쌈"""
+    parts = []
+    last = 0
+    for match in URL_PATTERN.finditer(line):
+        url = match.group(0).rstrip(URL_TRAILING)
+        end = match.start() + len(url)
+        parts.append(html.escape(line[last : match.start()]))
+        href = html.escape(url, quote=True)
+        parts.append(f'<a href="{href}" rel="nofollow noopener noreferrer">{href}</a>')
+        last = end
+    parts.append(html.escape(line[last:]))
+    return "".join(parts)
+
+
+def render_html(text: str) -> str:
+    """평문 본문을 HTML로 변환 (모든 문자를 escape하고 문단, 줄바꿈, 링크만 생성)"""
+    paragraphs = re.split(r"\n\s*\n", text.replace("\r\n", "\n").strip())
+    return "".join(
+        "<p>" + "<br>".join(_linkify(line) for line in paragraph.split("\n")) + "</p>"
+        for paragraph in paragraphs
+        if paragraph
+    )
+
+
+class HTMLRenderer:
+    """본문 해시별로 렌더링 결과를 캐시"""
+
+    def __init__(self, maxsize: int = RENDER_CACHE_SIZE, ttl: float = RENDER_CACHE_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def render(self, text: str) -> str:
+        key = content_hash(text)
+        rendered = self._cache.get(key)
+        if rendered is None:
+            rendered = render_html(text)
+            self._cache.set(key, rendered)
+        return rendered
+
+    def clear(self) -> None:
+        self._cache.clear()
@@ -1,16 +1,19 @@
 -- 익명 게시판 스키마
--- Supabase SQL Editor에서 실행하세요
+-- Supabase SQL Editor에서 실행하세요 (이미 만든 DB는 migrations/의 파일을 번호 순서대로 실행)
 
 -- 게시글 테이블
 CREATE TABLE posts (
     id SERIAL PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
     content TEXT NOT NULL,
+    content_html TEXT,  -- 쓰기 시 렌더링한 HTML (NULL이면 읽을 때 렌더링)
     author_name VARCHAR(100) NOT NULL DEFAULT '익명',
     password VARCHAR(255) NOT NULL,  -- 수정/삭제용 비밀번호 (해시 저장)
     view_count INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,  -- 댓글 수 (트리거로 유지)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_activity_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()  -- 작성 또는 마지막 댓글 시각 (트리거로 유지)
 );
 
 -- 댓글 테이블 (대댓글 지원: parent_id로 계층 구조)
@@ -19,6 +22,7 @@ CREATE TABLE comments (
     post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
     parent_id INTEGER REFERENCES comments(id) ON DELETE CASCADE,  -- NULL이면 댓글, 값이 있으면 대댓글
     content TEXT NOT NULL,
+    content_html TEXT,
     author_name VARCHAR(100) NOT NULL DEFAULT '익명',
     password VARCHAR(255) NOT NULL,  -- 수정/삭제용 비밀번호 (해시 저장)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -27,12 +31,266 @@ CREATE TABLE comments (
 
 -- 인덱스 생성
 CREATE INDEX idx_posts_created_at ON posts(created_at DESC);
-CREATE INDEX idx_comments_post_id ON comments(post_id);
+CREATE INDEX idx_posts_last_activity ON posts(last_activity_at DESC, id DESC);
+CREATE INDEX idx_comments_post_id_created_at ON comments(post_id, created_at);  -- 게시글별 댓글 목록 (정렬 없이 인덱스 순서로)
 CREATE INDEX idx_comments_parent_id ON comments(parent_id);
 
+-- 게시글별 댓글 수와 마지막 활동 시각 유지 (count(*)/max() 없이 O(1) 조회)
+CREATE OR REPLACE FUNCTION update_post_comment_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE posts
+        SET comment_count = comment_count + 1,
+            last_activity_at = GREATEST(last_activity_at, NEW.created_at)
+        WHERE id = NEW.post_id;
+    ELSE
+        UPDATE posts SET comment_count = comment_count - 1 WHERE id = OLD.post_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_comments_count
+AFTER INSERT OR DELETE ON comments
+FOR EACH ROW EXECUTE FUNCTION update_post_comment_count();
+
+-- 최근 활동순 게시글 목록 (keyset 페이지네이션, idx_posts_last_activity 한 번의 스캔)
+-- before_at/before_id는 이전 페이지 마지막 게시글 (NULL이면 첫 페이지)
+CREATE OR REPLACE FUNCTION activity_feed(before_at TIMESTAMPTZ, before_id INTEGER, page_size INTEGER)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_agg(to_jsonb(p) ORDER BY p.last_activity_at DESC, p.id DESC), '[]'::jsonb)
+    FROM (
+        SELECT id, title, content, content_html, author_name, view_count, comment_count,
+               created_at, updated_at, last_activity_at
+        FROM posts
+        WHERE (last_activity_at, id) < (COALESCE(before_at, 'infinity'), COALESCE(before_id, 2147483647))
+        ORDER BY last_activity_at DESC, id DESC
+        LIMIT page_size
+    ) AS p;
+$$ LANGUAGE sql STABLE;
+
+-- 모아둔 조회수 증가를 한 번에 반영 (게시글 id별 증가량)
+CREATE OR REPLACE FUNCTION increment_view_counts(post_ids BIGINT[], increments BIGINT[])
+RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE posts p
+    SET view_count = p.view_count + v.increment
+    FROM unnest(post_ids, increments) AS v(id, increment)
+    WHERE p.id = v.id;
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- === 댓글 증분 동기화 ===
+-- 삭제된 댓글 기록 (대댓글 cascade 삭제 포함)
+CREATE TABLE comment_tombstones (
+    comment_id INTEGER PRIMARY KEY,
+    post_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_comments_post_id_updated_at ON comments(post_id, updated_at);
+CREATE INDEX idx_comment_tombstones_post_id ON comment_tombstones(post_id, deleted_at);
+
+CREATE OR REPLACE FUNCTION record_comment_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO comment_tombstones (comment_id, post_id) VALUES (OLD.id, OLD.post_id)
+    ON CONFLICT (comment_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER trg_comments_tombstone
+AFTER DELETE ON comments
+FOR EACH ROW EXECUTE FUNCTION record_comment_tombstone();
+
+-- 수정 시각은 DB 시계로 기록 (앱 서버 시계가 늦으면 증분 동기화 cursor 아래로 빠짐)
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 조회수/댓글 수 갱신은 수정이 아니므로 본문 컬럼이 바뀔 때만
+CREATE TRIGGER trg_posts_updated_at
+BEFORE UPDATE OF title, content ON posts
+FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+CREATE TRIGGER trg_comments_updated_at
+BEFORE UPDATE OF content ON comments
+FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- 변경이 없을 때 증분 동기화 cursor를 DB 시계 기준으로 옮기는 데 사용
+CREATE OR REPLACE FUNCTION db_now()
+RETURNS TIMESTAMPTZ AS $$
+    SELECT NOW();
+$$ LANGUAGE sql STABLE;
+
+-- 오래된 삭제 기록 정리 (이보다 오래된 since로 요청한 클라이언트는 전체 재동기화)
+CREATE OR REPLACE FUNCTION prune_comment_tombstones(keep_days INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    pruned INTEGER;
+BEGIN
+    DELETE FROM comment_tombstones WHERE deleted_at < NOW() - make_interval(days => keep_days);
+    GET DIAGNOSTICS pruned = ROW_COUNT;
+    RETURN pruned;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- === 오래된 게시글 보관 테이블 (cold storage) ===
+-- archive_old_posts()가 오래된 게시글과 댓글을 옮겨 posts/comments와 인덱스를 작게 유지
+CREATE TABLE posts_archive (
+    id INTEGER PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    content TEXT NOT NULL,
+    content_html TEXT,
+    author_name VARCHAR(100) NOT NULL DEFAULT '익명',
+    password VARCHAR(255) NOT NULL,
+    view_count INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    last_activity_at TIMESTAMP WITH TIME ZONE,
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE comments_archive (
+    id INTEGER PRIMARY KEY,
+    post_id INTEGER NOT NULL REFERENCES posts_archive(id) ON DELETE CASCADE,
+    parent_id INTEGER,
+    content TEXT NOT NULL,
+    content_html TEXT,
+    author_name VARCHAR(100) NOT NULL DEFAULT '익명',
+    password VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX idx_comments_archive_post_id ON comments_archive(post_id, created_at);
+
+-- older_than_days일 동안 활동(작성, 댓글)이 없는 게시글을 batch_size개씩 보관 테이블로 이동
+-- (댓글은 게시글 삭제 시 cascade되므로 먼저 복사)
+CREATE OR REPLACE FUNCTION archive_old_posts(older_than_days INTEGER, batch_size INTEGER DEFAULT 1000)
+RETURNS INTEGER AS $$
+DECLARE
+    target_ids INTEGER[];
+BEGIN
+    SELECT array_agg(id) INTO target_ids
+    FROM (
+        SELECT id FROM posts
+        WHERE last_activity_at < NOW() - make_interval(days => older_than_days)
+        ORDER BY last_activity_at
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    ) AS old_posts;
+
+    IF target_ids IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    INSERT INTO posts_archive (id, title, content, content_html, author_name, password, view_count, comment_count, created_at, updated_at, last_activity_at)
+    SELECT id, title, content, content_html, author_name, password, view_count, comment_count, created_at, updated_at, last_activity_at
+    FROM posts WHERE id = ANY(target_ids);
+
+    INSERT INTO comments_archive (id, post_id, parent_id, content, content_html, author_name, password, created_at, updated_at)
+    SELECT id, post_id, parent_id, content, content_html, author_name, password, created_at, updated_at
+    FROM comments WHERE post_id = ANY(target_ids);
+
+    DELETE FROM posts WHERE id = ANY(target_ids);
+
+    -- 옮긴 댓글은 삭제된 것이 아니므로 cascade로 남은 삭제 기록을 지움
+    -- (실제로 삭제된 댓글의 기록은 comment_id가 달라 그대로 남음)
+    DELETE FROM comment_tombstones
+    WHERE comment_id IN (SELECT id FROM comments_archive WHERE post_id = ANY(target_ids));
+
+    RETURN array_length(target_ids, 1);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;  -- 보관 테이블 쓰기는 함수로만 허용
+
+-- === 등록 API Idempotency-Key (여러 워커/인스턴스가 공유) ===
+-- response가 NULL이면 처리 중 (처리하던 워커가 죽어도 lease가 지나면 다시 실행 가능)
+CREATE TABLE idempotency_keys (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    request_hash TEXT NOT NULL,
+    response JSONB,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (scope, key)
+);
+
+CREATE INDEX idx_idempotency_keys_created_at ON idempotency_keys(created_at);
+
+-- 키를 선점하면 NULL, 이미 있으면 {request_hash, response} 반환
+CREATE OR REPLACE FUNCTION claim_idempotency_key(
+    key_scope TEXT, idempotency_key TEXT, payload_hash TEXT, ttl_seconds INTEGER, lease_seconds INTEGER
+)
+RETURNS JSONB AS $$
+DECLARE
+    existing idempotency_keys;
+BEGIN
+    DELETE FROM idempotency_keys
+    WHERE scope = key_scope AND key = idempotency_key
+      AND (created_at < NOW() - make_interval(secs => ttl_seconds)
+           OR (response IS NULL AND created_at < NOW() - make_interval(secs => lease_seconds)));
+
+    LOOP
+        INSERT INTO idempotency_keys (scope, key, request_hash)
+        VALUES (key_scope, idempotency_key, payload_hash)
+        ON CONFLICT (scope, key) DO NOTHING;
+        IF FOUND THEN
+            RETURN NULL;
+        END IF;
+
+        SELECT * INTO existing FROM idempotency_keys
+        WHERE scope = key_scope AND key = idempotency_key;
+        IF FOUND THEN
+            RETURN jsonb_build_object('request_hash', existing.request_hash, 'response', existing.response);
+        END IF;
+        -- 그 사이 선점한 요청이 실패해 키를 놓았으면 다시 시도
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION complete_idempotency_key(key_scope TEXT, idempotency_key TEXT, response_json TEXT)
+RETURNS VOID AS $$
+    UPDATE idempotency_keys SET response = response_json::jsonb
+    WHERE scope = key_scope AND key = idempotency_key;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+-- 실패한 요청은 키를 놓아 재시도할 수 있게 함
+CREATE OR REPLACE FUNCTION release_idempotency_key(key_scope TEXT, idempotency_key TEXT)
+RETURNS VOID AS $$
+    DELETE FROM idempotency_keys
+    WHERE scope = key_scope AND key = idempotency_key AND response IS NULL;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION prune_idempotency_keys(ttl_seconds INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    pruned INTEGER;
+BEGIN
+    DELETE FROM idempotency_keys WHERE created_at < NOW() - make_interval(secs => ttl_seconds);
+    GET DIAGNOSTICS pruned = ROW_COUNT;
+    RETURN pruned;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
 -- RLS(Row Level Security) 비활성화 (익명 게시판이므로 공개)
 ALTER TABLE posts ENABLE ROW LEVEL SECURITY;
 ALTER TABLE comments ENABLE ROW LEVEL SECURITY;
+ALTER TABLE posts_archive ENABLE ROW LEVEL SECURITY;
+ALTER TABLE comments_archive ENABLE ROW LEVEL SECURITY;
+ALTER TABLE comment_tombstones ENABLE ROW LEVEL SECURITY;
+-- 정책 없음: 함수로만 접근
+ALTER TABLE idempotency_keys ENABLE ROW LEVEL SECURITY;
 
 -- 모든 사용자가 읽기/쓰기 가능하도록 정책 설정
 CREATE POLICY "Enable read access for all users" ON posts FOR SELECT USING (true);
@@ -44,3 +302,8 @@ CREATE POLICY "Enable read access for all users" ON comments FOR SELECT USING (t
 CREATE POLICY "Enable insert for all users" ON comments FOR INSERT WITH CHECK (true);
 CREATE POLICY "Enable update for all users" ON comments FOR UPDATE USING (true);
 CREATE POLICY "Enable delete for all users" ON comments FOR DELETE USING (true);
+
+-- 보관 테이블은 읽기 전용
+CREATE POLICY "Enable read access for all users" ON posts_archive FOR SELECT USING (true);
+CREATE POLICY "Enable read access for all users" ON comments_archive FOR SELECT USING (true);
+CREATE POLICY "Enable read access for all users" ON comment_tombstones FOR SELECT USING (true);
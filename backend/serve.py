@@ -0,0 +1,63 @@
+"""운영 실행기
+
+코어 수와 측정한 bcrypt 해시 비용으로 uvicorn 워커 수, 워커별 스레드풀/해시 풀
+크기를 정하고 구성을 출력한 뒤 서버를 실행한다. 워커에는 HASH_POOL_SIZE,
+HASH_QUEUE_SIZE, THREADPOOL_SIZE 환경 변수로 전달한다.
+
+    python serve.py --host 0.0.0.0 --port 9010 [--workers N] [--dry-run]
+"""
+
+import argparse
+import json
+import os
+
+from dotenv import load_dotenv
+
+import topology
+
+# database.py와 같은 기본값 (워커마다 이만큼 PostgREST/Postgres 연결을 엶)
+DEFAULT_DB_POOL_SIZE = 20
+
+
+def db_pool_size() -> int:
+    if os.getenv("DB_BACKEND", "supabase") == "postgres":
+        return int(os.getenv("DATABASE_POOL_MAX", "10"))
+    return int(os.getenv("SUPABASE_POOL_SIZE", str(DEFAULT_DB_POOL_SIZE)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the board API with sized workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9010)
+    parser.add_argument("--workers", type=int, help="워커 수 (기본: 사용 가능한 코어 수)")
+    parser.add_argument("--dry-run", action="store_true", help="구성만 출력")
+    args = parser.parse_args()
+    load_dotenv()
+
+    chosen = topology.plan(
+        topology.available_cores(),
+        topology.measure_hash_ms(),
+        db_pool_size(),
+        workers=args.workers,
+    )
+    print(json.dumps(chosen))
+    if args.dry_run:
+        return
+
+    os.environ["HASH_POOL_SIZE"] = str(chosen["hash_pool_size"])
+    os.environ["HASH_QUEUE_SIZE"] = str(chosen["hash_queue_size"])
+    os.environ["THREADPOOL_SIZE"] = str(chosen["threadpool_size"])
+
+    import uvicorn
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=chosen["workers"],
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Supabase(PostgREST) 클라이언트 생성
+
+supabase/httpx import와 커넥션 풀 생성 비용이 크므로 database.get_supabase()가
+처음 호출될 때만 import한다.
+"""
+
+import logging
+import random
+import threading
+import time
+from urllib.parse import unquote_plus
+
+import httpx
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient
+from supabase import Client, ClientOptions
+
+from circuit import CircuitBreaker
+from database import (
+    SUPABASE_CONNECT_TIMEOUT,
+    SUPABASE_HTTP2,
+    SUPABASE_KEEPALIVE_EXPIRY,
+    SUPABASE_POOL_KEEPALIVE,
+    SUPABASE_POOL_SIZE,
+    SUPABASE_READ_RETRIES,
+    SUPABASE_RETRY_BACKOFF,
+    SUPABASE_TIMEOUT,
+    breaker,
+    get_transport,
+)
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 재시도해도 안전한(멱등) 메서드와 일시적 오류 상태 코드
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+
+class PooledTransport(httpx.BaseTransport):
+    """풀 포화 통계를 수집하고 멱등 읽기를 지터 백오프로 재시도하는 트랜스포트"""
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        pool_size: int,
+        retries: int = 0,
+        backoff: float = 0.05,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self._transport = transport
+        self.breaker = breaker
+        self._lock = threading.Lock()
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.saturated_requests = 0
+        self.retried_requests = 0
+        self._saturated = False
+
+    def _acquire(self) -> None:
+        with self._lock:
+            self.total_requests += 1
+            if self.in_flight >= self.pool_size:
+                # 포화 구간에 진입할 때 한 번만 경고
+                if not self._saturated:
+                    logger.warning(
+                        "Supabase connection pool saturated (%d/%d in flight)",
+                        self.in_flight,
+                        self.pool_size,
+                    )
+                    self._saturated = True
+                self.saturated_requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if self.in_flight < self.pool_size:
+                self._saturated = False
+
+    def _sleep_before_retry(self, attempt: int) -> None:
+        # full jitter: 0 ~ backoff * 2^attempt
+        with self._lock:
+            self.retried_requests += 1
+        time.sleep(random.uniform(0, self.backoff * (2**attempt)))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.breaker is None:
+            return self._traced_send(request)
+
+        # 재시도를 포함한 요청 하나를 한 번의 호출로 기록 (5xx와 연결 오류는 실패)
+        self.breaker.before_call()
+        started = time.perf_counter()
+        try:
+            response = self._traced_send(request)
+        except BaseException:
+            # 연결 오류뿐 아니라 어떤 예외든 기록해야 시험 호출 중 상태가 풀림
+            self.breaker.record(False, (time.perf_counter() - started) * 1000)
+            raise
+        self.breaker.record(
+            response.status_code < 500, (time.perf_counter() - started) * 1000
+        )
+        return response
+
+    def _traced_send(self, request: httpx.Request) -> httpx.Response:
+        table = request.url.path.rsplit("/rest/v1/", 1)[-1]
+        with span(
+            "postgrest",
+            **{
+                "http.method": request.method,
+                "db.table": table,
+                "db.filter": unquote_plus(request.url.query.decode()),
+            },
+        ) as s:
+            response = self._send(request)
+            if s is not None:
+                s.attributes["http.status_code"] = response.status_code
+            return response
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        retries = self.retries if request.method in IDEMPOTENT_METHODS else 0
+        self._acquire()
+        try:
+            attempt = 0
+            while True:
+                try:
+                    response = self._transport.handle_request(request)
+                except httpx.TransportError:
+                    if attempt >= retries:
+                        raise
+                else:
+                    if attempt >= retries or response.status_code not in RETRYABLE_STATUS_CODES:
+                        return response
+                    response.close()
+                self._sleep_before_retry(attempt)
+                attempt += 1
+        finally:
+            self._release()
+
+    def stats(self) -> dict:
+        """풀 사용 현황"""
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "total_requests": self.total_requests,
+                "saturated_requests": self.saturated_requests,
+                "retried_requests": self.retried_requests,
+            }
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+def create_transport() -> PooledTransport:
+    """모든 PostgREST 세션이 공유하는 커넥션 풀"""
+    return PooledTransport(
+        httpx.HTTPTransport(
+            http2=SUPABASE_HTTP2,
+            limits=httpx.Limits(
+                max_connections=SUPABASE_POOL_SIZE,
+                max_keepalive_connections=SUPABASE_POOL_KEEPALIVE,
+                keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY,
+            ),
+        ),
+        pool_size=SUPABASE_POOL_SIZE,
+        retries=SUPABASE_READ_RETRIES,
+        backoff=SUPABASE_RETRY_BACKOFF,
+        breaker=breaker,
+    )
+
+
+class PooledPostgrestClient(SyncPostgrestClient):
+    """공유 커넥션 풀을 사용하는 PostgREST 클라이언트"""
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return SyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            transport=get_transport(),
+        )
+
+    def aclose(self) -> None:
+        # 공유 풀은 닫지 않는다 (인증 이벤트로 클라이언트가 재생성될 수 있음)
+        pass
+
+
+class PooledClient(Client):
+    """PooledPostgrestClient를 사용하는 Supabase 클라이언트"""
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout, verify=True, proxy=None):
+        return PooledPostgrestClient(
+            rest_url, headers=headers, schema=schema, timeout=timeout
+        )
+
+
+def create_client(url: str, key: str) -> Client:
+    return PooledClient.create(
+        url,
+        key,
+        ClientOptions(
+            postgrest_client_timeout=httpx.Timeout(
+                SUPABASE_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT
+            ),
+        ),
+    )
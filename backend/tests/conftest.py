@@ -1,5 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
+import main
 from main import app
 
 
@@ -7,3 +8,14 @@ from main import app
 def client():
     """FastAPI 테스트 클라이언트"""
     return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """테스트 간 캐시 상태 공유 방지"""
+    main.count_cache.clear()
+    main.idempotency_store.clear()
+    main.background_queue.clear()
+    main.last_good_reads.clear()
+    main.archived_posts.clear()
+    yield
@@ -0,0 +1,33 @@
+from unittest.mock import MagicMock
+
+from archive import ArchiveJob, archive_old_posts
+
+
+class TestArchive:
+    """오래된 게시글 보관 작업 테스트"""
+
+    def test_archive_repeats_until_batch_not_full(self):
+        """배치가 가득 차면 다음 배치를 계속 이동"""
+        mock_client = MagicMock()
+        mock_client.rpc.return_value.execute.side_effect = [
+            MagicMock(data=100),
+            MagicMock(data=100),
+            MagicMock(data=30),
+        ]
+
+        moved = archive_old_posts(mock_client, older_than_days=180, batch_size=100)
+
+        assert moved == 230
+        assert mock_client.rpc.call_count == 3
+        mock_client.rpc.assert_called_with(
+            "archive_old_posts", {"older_than_days": 180, "batch_size": 100}
+        )
+
+    def test_job_run_once_uses_current_client(self):
+        """작업은 실행할 때마다 클라이언트를 새로 가져옴"""
+        mock_client = MagicMock()
+        mock_client.rpc.return_value.execute.return_value.data = 0
+        job = ArchiveJob(lambda: mock_client, 30, 500, interval=3600)
+
+        assert job.run_once() == 0
+        mock_client.rpc.assert_called_once()
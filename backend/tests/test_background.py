@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from background import BackgroundQueue
+
+
+class TestBackgroundQueue:
+    """백그라운드 작업 큐 테스트"""
+
+    def test_items_are_processed_in_batches_by_kind(self):
+        """같은 종류의 작업은 한 번의 handler 호출로 처리"""
+        q = BackgroundQueue(maxsize=10, batch_size=10, flush_interval=0)
+        views, audits = [], []
+        q.register("view", views.append)
+        q.register("audit", audits.append)
+
+        for item in [1, 2, 1]:
+            q.submit("view", item)
+        q.submit("audit", "login")
+        q.flush()
+
+        assert views == [[1, 2, 1]]
+        assert audits == [["login"]]
+        assert q.stats()["processed"] == 4
+
+    def test_full_queue_drops_and_counts(self):
+        """큐가 가득 차면 버리고 dropped로 집계"""
+        q = BackgroundQueue(maxsize=2)
+        q.register("view", lambda items: None)
+
+        assert [q.submit("view", i) for i in range(3)] == [True, True, False]
+        stats = q.stats()
+        assert stats["dropped"] == 1
+        assert stats["depth"] == 2
+        assert stats["max_depth"] == 2
+
+    def test_failed_batch_is_counted(self):
+        """handler가 실패하면 failed로 집계하고 다음 배치는 계속 처리"""
+        q = BackgroundQueue(maxsize=10)
+
+        def fail(items):
+            raise RuntimeError("db down")
+
+        q.register("view", fail)
+        q.submit("view", 1)
+        q.flush()
+
+        assert q.stats()["failed"] == 1
+
+    def test_drain_processes_pending_items_and_rejects_new(self):
+        """종료 시 남은 작업을 처리하고 이후 작업은 받지 않음"""
+        q = BackgroundQueue(maxsize=100, flush_interval=0.01)
+        processed = []
+        started = threading.Event()
+
+        def handle(items):
+            started.wait()
+            processed.extend(items)
+
+        q.register("view", handle)
+        q.start()
+        for i in range(20):
+            q.submit("view", i)
+        started.set()
+
+        assert q.drain(timeout=5) == 0
+        assert sorted(processed) == list(range(20))
+        assert q.submit("view", 99) is False
+
+    def test_unknown_kind_is_rejected(self):
+        with pytest.raises(KeyError):
+            BackgroundQueue().submit("missing", 1)
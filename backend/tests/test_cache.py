@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from cache import TTLCache
+
+
+class TestTTLCache:
+    """TTL 캐시 테스트"""
+
+    def test_get_and_set(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("b", "default") == "default"
+
+    def test_expired_entries_are_dropped(self):
+        """만료된 항목은 조회되지 않음"""
+        cache = TTLCache(maxsize=10, ttl=10)
+        with patch("cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """크기 제한을 넘으면 가장 오래 사용되지 않은 항목 제거"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_pop(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
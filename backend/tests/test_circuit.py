@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+import pytest
+
+from circuit import CircuitBreaker, CircuitOpenError
+
+
+def make_breaker(**kwargs):
+    options = {
+        "window": 4,
+        "min_calls": 4,
+        "failure_rate": 0.5,
+        "slow_call_ms": 1000,
+        "open_seconds": 10,
+    }
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+class TestCircuitBreaker:
+    """DB 회로 차단기 테스트"""
+
+    def test_opens_when_failure_rate_reached(self):
+        """최근 호출 중 실패 비율이 기준 이상이면 차단"""
+        breaker = make_breaker()
+        for success in [True, True, False]:
+            breaker.before_call()
+            breaker.record(success, 10)
+        assert breaker.state == "closed"
+
+        breaker.before_call()
+        breaker.record(False, 10)
+
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.stats()["rejected_calls"] == 1
+
+    def test_slow_calls_count_as_failures(self):
+        """느린 호출도 실패로 집계"""
+        breaker = make_breaker(min_calls=2)
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record(True, 5000)
+
+        assert breaker.is_open()
+
+    def test_half_open_allows_single_trial(self):
+        """대기 시간이 지나면 시험 호출 하나만 허용하고 성공하면 닫힘"""
+        breaker = make_breaker(min_calls=1)
+        with patch("circuit.time.monotonic", return_value=100.0):
+            breaker.before_call()
+            breaker.record(False, 10)
+
+        with patch("circuit.time.monotonic", return_value=111.0):
+            assert not breaker.is_open()
+            breaker.before_call()
+            with pytest.raises(CircuitOpenError):
+                breaker.before_call()  # 시험 호출 진행 중
+            breaker.record(True, 10)
+
+        assert breaker.state == "closed"
+
+    def test_failed_trial_reopens(self):
+        """시험 호출이 실패하면 다시 차단"""
+        breaker = make_breaker(min_calls=1)
+        with patch("circuit.time.monotonic", return_value=100.0):
+            breaker.before_call()
+            breaker.record(False, 10)
+
+        with patch("circuit.time.monotonic", return_value=111.0):
+            breaker.before_call()
+            breaker.record(False, 10)
+            assert breaker.is_open()
+
+        assert breaker.stats()["opened_count"] == 2
@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
 
 
@@ -43,6 +44,7 @@ class TestCommentsAPI:
             assert isinstance(data, list)
             assert len(data) == 2
             assert data[0]["content"] == "첫 번째 댓글"
+            assert data[0]["content_html"] == "<p>첫 번째 댓글</p>"  # 저장된 HTML이 없으면 렌더링
             assert data[1]["parent_id"] == 1
 
     def test_get_comments_empty_list(self, client):
@@ -59,6 +61,149 @@ class TestCommentsAPI:
             assert response.status_code == 200
             assert response.json() == []
 
+    def test_get_comments_checks_archive_only_for_archived_posts(self, client):
+        """댓글이 없는 일반 게시글은 보관 여부를 한 번만 확인하고 보관 테이블은 조회하지 않음"""
+        tables = {name: MagicMock() for name in ("comments", "comments_archive", "posts_archive")}
+        tables["comments"].select.return_value.eq.return_value.order.return_value.execute.return_value.data = []
+        tables["posts_archive"].select.return_value.eq.return_value.execute.return_value.data = []
+
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.table.side_effect = lambda name: tables[name]
+            mock_supabase.return_value = mock_client
+
+            assert client.get("/api/posts/1/comments").json() == []
+            assert client.get("/api/posts/1/comments").json() == []
+
+            assert tables["posts_archive"].select.call_count == 1
+            tables["comments_archive"].select.assert_not_called()
+
+    # === 댓글 증분 동기화 테스트 ===
+    def test_get_comment_changes_returns_delta_and_tombstones(self, client):
+        """since 이후 변경된 댓글과 삭제된 댓글 id, 다음 cursor(가장 최근 변경 - margin) 반환"""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        changed = [
+            {
+                "id": 3,
+                "post_id": 1,
+                "parent_id": None,
+                "content": "수정된 댓글",
+                "author_name": "익명",
+                "created_at": (now - timedelta(hours=3)).isoformat(),
+                "updated_at": (now - timedelta(hours=2)).isoformat(),
+            }
+        ]
+        deleted_at = (now - timedelta(hours=1)).isoformat()
+        deleted = [
+            {"comment_id": 4, "deleted_at": deleted_at},
+            {"comment_id": 5, "deleted_at": deleted_at},  # cascade된 대댓글
+        ]
+
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            query = mock_client.table.return_value.select.return_value.eq.return_value.gte.return_value
+            query.order.return_value.execute.return_value.data = changed
+            query.execute.return_value.data = deleted
+            mock_supabase.return_value = mock_client
+
+            response = client.get(
+                "/api/posts/1/comments/changes",
+                params={"since": (now - timedelta(days=1)).isoformat()},
+            )
+
+            assert response.status_code == 200
+            data = response.json()
+            assert [c["id"] for c in data["comments"]] == [3]
+            assert data["deleted_ids"] == [4, 5]
+            assert data["cursor"] == (now - timedelta(hours=1, seconds=5)).isoformat()
+            mock_client.table.assert_any_call("comment_tombstones")
+
+    def test_get_comment_changes_without_changes_advances_cursor(self, client):
+        """변경이 없으면 DB 시각 - margin으로 cursor를 옮김 (시간대 없으면 UTC)"""
+        db_now = datetime.now(timezone.utc).replace(microsecond=0)
+        since = db_now - timedelta(days=1)
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            query = mock_client.table.return_value.select.return_value.eq.return_value.gte.return_value
+            query.order.return_value.execute.return_value.data = []
+            query.execute.return_value.data = []
+            mock_client.rpc.return_value.execute.return_value.data = db_now.isoformat()
+            mock_supabase.return_value = mock_client
+
+            response = client.get(
+                "/api/posts/1/comments/changes",
+                params={"since": since.replace(tzinfo=None).isoformat()},
+            )
+
+            assert response.json() == {
+                "comments": [],
+                "deleted_ids": [],
+                "cursor": (db_now - timedelta(seconds=5)).isoformat(),
+            }
+            mock_client.rpc.assert_called_once_with("db_now", {})
+
+    def test_get_comment_changes_without_changes_keeps_recent_cursor(self, client):
+        """since가 DB 시각 - margin보다 최근이면 cursor를 뒤로 돌리지 않음"""
+        db_now = datetime.now(timezone.utc).replace(microsecond=0)
+        since = db_now - timedelta(seconds=1)
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            query = mock_client.table.return_value.select.return_value.eq.return_value.gte.return_value
+            query.order.return_value.execute.return_value.data = []
+            query.execute.return_value.data = []
+            mock_client.rpc.return_value.execute.return_value.data = db_now.isoformat()
+            mock_supabase.return_value = mock_client
+
+            response = client.get(
+                "/api/posts/1/comments/changes", params={"since": since.isoformat()}
+            )
+
+            assert response.json()["cursor"] == since.isoformat()
+
+    def test_get_comment_changes_since_older_than_window(self, client):
+        """삭제 기록 보관 기간보다 오래된 since는 410 (전체 다시 조회)"""
+        since = datetime.now(timezone.utc) - timedelta(days=60)
+        with patch("main.get_supabase") as mock_supabase:
+            response = client.get(
+                "/api/posts/1/comments/changes", params={"since": since.isoformat()}
+            )
+
+            assert response.status_code == 410
+            mock_supabase.assert_not_called()
+
+    def test_get_comment_changes_requires_since(self, client):
+        """since 없으면 422"""
+        response = client.get("/api/posts/1/comments/changes")
+        assert response.status_code == 422
+
+    # === 댓글 개수 테스트 ===
+    def test_get_comments_count(self, client):
+        """게시글의 comment_count로 댓글 개수 반환"""
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+                {"comment_count": 5000}
+            ]
+            mock_supabase.return_value = mock_client
+
+            response = client.get("/api/posts/1/comments/count")
+
+            assert response.status_code == 200
+            assert response.json() == {"total": 5000, "estimated": False}
+
+    def test_get_comments_count_post_not_found(self, client):
+        """존재하지 않는 게시글이면 404"""
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = (
+                []
+            )
+            mock_supabase.return_value = mock_client
+
+            response = client.get("/api/posts/999/comments/count")
+
+            assert response.status_code == 404
+
     # === 댓글 등록 테스트 ===
     def test_create_comment_success(self, client):
         """댓글 등록 성공"""
@@ -164,6 +309,39 @@ class TestCommentsAPI:
         )
         assert response.status_code == 422
 
+    def test_create_comment_replays_response_for_same_idempotency_key(self, client):
+        """같은 Idempotency-Key로 재시도하면 댓글을 중복 저장하지 않음"""
+        mock_created = {
+            "id": 1,
+            "post_id": 1,
+            "parent_id": None,
+            "content": "댓글",
+            "author_name": "익명",
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "updated_at": "2025-01-01T00:00:00+00:00",
+        }
+
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            # idempotency_keys 테이블에서 키를 새로 선점
+            mock_client.rpc.return_value.execute.return_value.data = None
+            mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+                {"id": 1}
+            ]
+            mock_client.table.return_value.insert.return_value.execute.return_value.data = [
+                mock_created
+            ]
+            mock_supabase.return_value = mock_client
+
+            body = {"content": "댓글", "password": "1234"}
+            headers = {"Idempotency-Key": "retry-1"}
+            first = client.post("/api/posts/1/comments", json=body, headers=headers)
+            second = client.post("/api/posts/1/comments", json=body, headers=headers)
+
+            assert first.json() == second.json()
+            assert second.headers["Idempotent-Replayed"] == "true"
+            assert mock_client.table.return_value.insert.call_count == 1
+
     # === 댓글 수정 테스트 ===
     def test_update_comment_success(self, client):
         """댓글 수정 성공"""
@@ -208,6 +386,10 @@ class TestCommentsAPI:
             assert response.status_code == 200
             data = response.json()
             assert data["content"] == "수정된 댓글"
+            assert data["updated_at"] == "2025-01-02T00:00:00+00:00"
+            # 수정 시각은 DB 트리거가 기록 (앱 서버 시계를 쓰지 않음)
+            update_data = mock_client.table.return_value.update.call_args.args[0]
+            assert "updated_at" not in update_data
 
     def test_update_comment_wrong_password(self, client):
         """잘못된 비밀번호로 댓글 수정 시 403"""
@@ -0,0 +1,214 @@
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+import database
+from circuit import CircuitBreaker, CircuitOpenError
+from supabase_client import PooledTransport
+
+
+def make_transport(handler, pool_size=2, retries=2):
+    return PooledTransport(
+        httpx.MockTransport(handler), pool_size=pool_size, retries=retries, backoff=0
+    )
+
+
+class TestPooledTransport:
+    """Supabase 커넥션 풀 트랜스포트 테스트"""
+
+    def test_retries_idempotent_read_on_transport_error(self):
+        """GET 요청은 일시적 연결 오류 시 재시도"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) < 3:
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(200, json=[])
+
+        transport = make_transport(handler)
+        with httpx.Client(transport=transport) as client:
+            response = client.get("http://test/rest/v1/posts")
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+        assert transport.stats()["retried_requests"] == 2
+
+    def test_retries_idempotent_read_on_gateway_error(self):
+        """GET 요청은 503 응답 시 재시도"""
+        statuses = iter([503, 200])
+
+        def handler(request):
+            return httpx.Response(next(statuses), json=[])
+
+        with httpx.Client(transport=make_transport(handler)) as client:
+            response = client.get("http://test/rest/v1/posts")
+
+        assert response.status_code == 200
+
+    def test_gives_up_after_max_retries(self):
+        """재시도 횟수를 넘기면 오류 전파"""
+
+        def handler(request):
+            raise httpx.ReadTimeout("timed out")
+
+        with httpx.Client(transport=make_transport(handler, retries=1)) as client:
+            with pytest.raises(httpx.ReadTimeout):
+                client.get("http://test/rest/v1/posts")
+
+    def test_does_not_retry_writes(self):
+        """POST/PATCH 등 쓰기 요청은 재시도하지 않음"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ConnectError("connection refused")
+
+        with httpx.Client(transport=make_transport(handler)) as client:
+            with pytest.raises(httpx.ConnectError):
+                client.post("http://test/rest/v1/posts", json={})
+
+        assert len(calls) == 1
+
+    def test_reports_pool_saturation(self):
+        """풀 크기 이상 동시 요청 시 포화 횟수 기록"""
+        transport = make_transport(lambda request: httpx.Response(200), pool_size=1)
+        transport.in_flight = 1  # 이미 한 요청이 진행 중인 상태
+
+        with httpx.Client(transport=transport) as client:
+            client.get("http://test/rest/v1/posts")
+
+        stats = transport.stats()
+        assert stats["saturated_requests"] == 1
+        assert stats["peak_in_flight"] == 2
+        assert stats["in_flight"] == 1
+
+    def test_circuit_opens_on_server_errors(self):
+        """5xx가 이어지면 회로를 열고 이후 요청은 보내지 않음"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500, json={})
+
+        breaker = CircuitBreaker(window=4, min_calls=2, failure_rate=0.5, open_seconds=60)
+        transport = PooledTransport(
+            httpx.MockTransport(handler), pool_size=2, breaker=breaker
+        )
+        with httpx.Client(transport=transport) as client:
+            client.get("http://test/rest/v1/posts")
+            client.get("http://test/rest/v1/posts")
+            with pytest.raises(CircuitOpenError):
+                client.get("http://test/rest/v1/posts")
+
+        assert len(calls) == 2
+
+    def test_unexpected_error_ends_half_open_trial(self):
+        """시험 호출 중 예상하지 못한 예외가 나도 실패로 기록해 회로가 영구히 막히지 않음"""
+        breaker = CircuitBreaker(window=4, min_calls=1, failure_rate=0.5, open_seconds=0)
+        breaker.record(False, 0)  # 열림 (open_seconds=0이므로 바로 시험 호출 가능)
+
+        def handler(request):
+            raise RuntimeError("unexpected")
+
+        transport = PooledTransport(httpx.MockTransport(handler), pool_size=2, breaker=breaker)
+        with httpx.Client(transport=transport) as client:
+            with pytest.raises(RuntimeError):
+                client.get("http://test/rest/v1/posts")
+
+        # 시험 호출이 끝났으므로 다음 시험 호출을 허용
+        breaker.before_call()
+
+
+class TestUnavailableErrors:
+    """stale 응답 대상 오류 분류 테스트"""
+
+    def test_classifies_database_outages(self):
+        from postgrest.exceptions import APIError
+
+        with patch.object(database, "DB_BACKEND", "supabase"):
+            assert database.is_unavailable_error(CircuitOpenError())
+            assert database.is_unavailable_error(httpx.ConnectError("refused"))
+            assert database.is_unavailable_error(APIError({"code": 503}))
+            assert database.is_unavailable_error(APIError({"code": "PGRST001"}))
+            assert database.is_unavailable_error(APIError({"code": "57014"}))  # statement timeout
+            assert not database.is_unavailable_error(APIError({"code": "23505"}))
+            assert not database.is_unavailable_error(KeyError("title"))
+
+    def test_classifies_postgres_outages(self):
+        from psycopg import OperationalError, errors
+        from psycopg_pool import PoolTimeout
+
+        with patch.object(database, "DB_BACKEND", "postgres"):
+            assert database.is_unavailable_error(OperationalError())
+            assert database.is_unavailable_error(PoolTimeout())
+            assert not database.is_unavailable_error(errors.UniqueViolation())
+
+
+class TestLazyClient:
+    """DB 클라이언트 지연 생성 테스트"""
+
+    def test_import_without_env_does_not_raise_or_load_supabase(self):
+        """환경 변수가 없어도 import는 성공하고 supabase/httpx는 불러오지 않음"""
+        env = {
+            k: v for k, v in os.environ.items() if not k.startswith(("SUPABASE_", "DATABASE_"))
+        }
+        code = (
+            "import sys, database; "
+            "assert 'supabase' not in sys.modules and 'httpx' not in sys.modules; "
+            "import main; assert 'supabase' not in sys.modules"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_missing_env_raises_on_first_use(self):
+        """설정이 없으면 처음 사용할 때 ValueError"""
+        with patch.object(database, "_client", None), patch.object(
+            database, "SUPABASE_URL", None
+        ), patch.object(database, "DB_BACKEND", "supabase"):
+            with pytest.raises(ValueError):
+                database.get_supabase()
+
+    def test_client_created_once(self):
+        """클라이언트는 한 번만 만들어 재사용"""
+        with patch.object(database, "_client", None), patch.object(
+            database, "_create_client", side_effect=lambda: object()
+        ) as create:
+            first = database.get_supabase()
+            assert database.get_supabase() is first
+        assert create.call_count == 1
+
+    def test_reset_after_fork_drops_client(self):
+        """fork된 자식은 부모의 클라이언트/커넥션 풀을 쓰지 않음"""
+        with patch.object(database, "_client", object()), patch.object(
+            database, "_transport", object()
+        ), patch.object(database, "_lock", database._lock):
+            database._reset_after_fork()
+            assert database._client is None
+            assert database._transport is None
+
+    def test_pool_stats_follow_backend(self):
+        """풀 통계는 사용 중인 백엔드의 것이고, 통계를 위해 풀을 만들지 않음"""
+        client = MagicMock()
+        client.stats.return_value = {"pool_size": 4, "requests_waiting": 0}
+        with patch.object(database, "DB_BACKEND", "postgres"), patch.object(
+            database, "_client", client
+        ), patch.object(database, "_transport", None):
+            assert database.get_pool_stats() == {"pool_size": 4, "requests_waiting": 0}
+            assert database._transport is None
+
+        with patch.object(database, "DB_BACKEND", "supabase"), patch.object(
+            database, "_transport", None
+        ):
+            assert database.get_pool_stats() is None
+            assert database._transport is None
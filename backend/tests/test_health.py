@@ -1,3 +1,10 @@
+import time
+from unittest.mock import patch, MagicMock
+
+import main
+from readiness import Readiness
+
+
 def test_health_check(client):
     """헬스 체크 엔드포인트 테스트"""
     response = client.get("/health")
@@ -5,3 +12,68 @@ def test_health_check(client):
     data = response.json()
     assert data["status"] == "ok"
     assert data["message"] == "API is running"
+
+
+def test_ready_while_warming_up(client):
+    """워밍업 전에는 503"""
+    with patch("main.readiness", Readiness()):
+        response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+
+
+def test_ready_after_warm_up(client):
+    """워밍업 완료 후 DB가 응답하면 200"""
+    state = Readiness()
+    transport = MagicMock()
+    transport.stats.return_value = {"pool_size": 20, "in_flight": 0}
+    with patch("main.get_supabase") as mock_supabase, patch(
+        "main.readiness", state
+    ), patch("database._transport", transport):
+        mock_supabase.return_value = MagicMock()
+        state.run_warm_up(main.warm_up_steps())
+
+        response = client.get("/ready")
+
+    assert state.warmup_errors == []
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["db_latency_ms"] is not None
+    assert "pool_size" in data["pool"]
+
+
+def test_ready_reports_startup_time(client):
+    """시작에 걸린 시간을 기록해 /ready에 표시"""
+    state = Readiness()
+    state.mark_started(time.perf_counter() - 0.25)
+    with patch("main.readiness", state):
+        response = client.get("/ready")
+    assert response.json()["startup_ms"] >= 250
+
+
+def test_ready_when_database_unreachable(client):
+    """DB 조회가 실패하면 503"""
+    state = Readiness()
+    state.warmed_up = True
+    with patch("main.get_supabase") as mock_supabase, patch("main.readiness", state):
+        mock_supabase.return_value.table.side_effect = ConnectionError("down")
+        response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
+
+
+def test_ready_when_database_slow(client):
+    """DB 응답이 임계값보다 느리면 503"""
+    state = Readiness()
+    state.warmed_up = True
+    with (
+        patch("main.get_supabase", return_value=MagicMock()),
+        patch("main.readiness", state),
+        patch("main.READY_MAX_DB_LATENCY_MS", -1),
+    ):
+        response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "degraded"
@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+from idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyReused,
+    IdempotencyStore,
+    fingerprint,
+)
+from maintenance import MaintenanceJob
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeRPC:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return FakeResponse(self._result())
+
+
+class SharedKeys:
+    """idempotency_keys 테이블 함수(claim/complete/release)를 흉내 내는 클라이언트"""
+
+    def __init__(self):
+        self.rows = {}
+
+        self.fail_complete = False
+
+    def rpc(self, fn, params):
+        key = (params.get("key_scope"), params.get("idempotency_key"))
+
+        def claim():
+            if key not in self.rows:
+                self.rows[key] = {"request_hash": params["payload_hash"], "response": None}
+                return None
+            return dict(self.rows[key])
+
+        def complete():
+            if self.fail_complete:
+                raise ConnectionError("db down")
+            self.rows[key]["response"] = json.loads(params["response_json"])
+
+        def release():
+            if self.rows.get(key, {}).get("response") is None:
+                self.rows.pop(key, None)
+
+        return FakeRPC(
+            {
+                "claim_idempotency_key": claim,
+                "complete_idempotency_key": complete,
+                "release_idempotency_key": release,
+            }[fn]
+        )
+
+
+class TestIdempotencyStore:
+    """Idempotency-Key 저장소 테스트"""
+
+    def make_workers(self, count=2):
+        shared = SharedKeys()
+        return shared, [IdempotencyStore(get_client=lambda: shared) for _ in range(count)]
+
+    def test_retry_on_another_worker_replays_response(self):
+        """다른 워커로 간 재시도도 다시 실행하지 않고 저장된 응답 재생"""
+        _, (first, second) = self.make_workers()
+        calls = []
+
+        def create():
+            calls.append(1)
+            return {"id": len(calls)}
+
+        assert first.run("posts", "abc", {"title": "제목"}, create) == ({"id": 1}, False)
+        assert second.run("posts", "abc", {"title": "제목"}, create) == ({"id": 1}, True)
+        assert len(calls) == 1
+
+    def test_in_progress_on_another_worker(self):
+        """다른 워커가 처리 중인 키는 실행하지 않고 IdempotencyKeyInProgress"""
+        shared, (_, second) = self.make_workers()
+        shared.rows[("posts", "abc")] = {
+            "request_hash": fingerprint({"title": "제목"}),
+            "response": None,
+        }
+
+        with pytest.raises(IdempotencyKeyInProgress):
+            second.run("posts", "abc", {"title": "제목"}, lambda: {"id": 1})
+
+    def test_reused_key_with_different_body_on_another_worker(self):
+        """다른 워커에서 같은 키를 다른 본문으로 재사용하면 IdempotencyKeyReused"""
+        _, (first, second) = self.make_workers()
+        first.run("posts", "abc", {"title": "제목"}, lambda: {"id": 1})
+
+        with pytest.raises(IdempotencyKeyReused):
+            second.run("posts", "abc", {"title": "다른 제목"}, lambda: {"id": 2})
+
+    def test_failed_request_releases_key(self):
+        """실패한 요청은 키를 놓아 다른 워커에서 다시 시도할 수 있음"""
+        shared, (first, second) = self.make_workers()
+
+        def fail():
+            raise RuntimeError("insert failed")
+
+        with pytest.raises(RuntimeError):
+            first.run("posts", "abc", {"title": "제목"}, fail)
+
+        assert shared.rows == {}
+        assert second.run("posts", "abc", {"title": "제목"}, lambda: {"id": 1}) == (
+            {"id": 1},
+            False,
+        )
+
+    def test_completed_request_survives_failed_complete(self):
+        """실행은 끝났는데 응답 기록이 실패해도 500 대신 응답을 돌려주고 다시 실행하지 않음"""
+        shared, (first, _) = self.make_workers()
+        shared.fail_complete = True
+        calls = []
+
+        def create():
+            calls.append(1)
+            return {"id": len(calls)}
+
+        assert first.run("posts", "abc", {"title": "제목"}, create) == ({"id": 1}, False)
+        assert first.run("posts", "abc", {"title": "제목"}, create) == ({"id": 1}, True)
+        assert len(calls) == 1
+
+
+class TestMaintenanceJob:
+    """주기 정리 작업 테스트"""
+
+    def test_runs_all_tasks_even_if_one_fails(self):
+        """한 작업이 실패해도 나머지 작업 실행"""
+
+        def broken():
+            raise RuntimeError("db down")
+
+        job = MaintenanceJob({"broken": broken, "keys": lambda: 3})
+        assert job.run_once() == {"keys": 3}
@@ -0,0 +1,176 @@
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from loadtest.explain import QUERY_SHAPES, QueryShape, check, find_problems
+from loadtest.seed import generate_comments, generate_posts, seed
+from loadtest.soak import Stats, parse_mix, percentile
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schema.sql"
+
+
+class TestSeedData:
+    """테스트 데이터 생성기 테스트"""
+
+    def test_view_counts_are_skewed(self):
+        """상위 소수 게시글에 조회수가 몰림"""
+        views = sorted(
+            (row[5] for row in generate_posts(1000, 1, "hash", max_views=100_000)),
+            reverse=True,
+        )
+        assert views[0] == 100_000
+        assert sum(views[:100]) > sum(views[100:])  # 상위 10%가 과반
+
+    def test_post_ids_are_sequential(self):
+        """start_id부터 연속된 id 생성"""
+        ids = [row[0] for row in generate_posts(5, 100, "hash")]
+        assert ids == [100, 101, 102, 103, 104]
+
+    def test_reply_chains_reference_same_post_and_respect_depth(self):
+        """대댓글은 같은 게시글의 이전 댓글을 부모로 하고 최대 깊이를 넘지 않음"""
+        posts = [(i, datetime.now(timezone.utc)) for i in range(1, 51)]
+        rows = list(generate_comments(posts, 20, max_depth=3, start_id=1, password_hash="hash"))
+        by_id = {row[0]: row for row in rows}
+        assert any(row[2] is not None for row in rows)
+
+        for comment_id, post_id, parent_id, *_ in rows:
+            depth = 0
+            while parent_id is not None:
+                parent = by_id[parent_id]
+                assert parent[1] == post_id
+                assert parent_id < comment_id
+                parent_id = parent[2]
+                depth += 1
+            assert depth <= 3
+
+    def test_comments_fall_between_post_creation_and_now(self):
+        """댓글은 게시글 작성 이후, 현재 이전 시각"""
+        posted = {i: datetime.now(timezone.utc) - timedelta(hours=i) for i in range(1, 51)}
+        rows = list(generate_comments(posted.items(), 30, max_depth=5, start_id=1,
+                                      password_hash="hash"))
+        now = datetime.now(timezone.utc)
+        assert rows
+        for row in rows:
+            assert posted[row[1]] <= row[6] <= now
+
+    def test_reply_probability_controls_chain_depth(self):
+        """대댓글 확률을 높이면 깊은 체인이 만들어짐"""
+        posts = [(1, datetime.now(timezone.utc) - timedelta(days=30))]
+        rows = list(generate_comments(posts, 500, max_depth=50, start_id=1,
+                                      password_hash="hash", seed=1, reply_probability=0.99))
+        parents = {row[0]: row[2] for row in rows}
+
+        def depth(comment_id):
+            d = 0
+            while parents[comment_id] is not None:
+                comment_id = parents[comment_id]
+                d += 1
+            return d
+
+        assert max(depth(c) for c in parents) == 50
+
+
+class TestSoakStats:
+    """소크 테스트 집계 테스트"""
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 95) == 0.0
+
+    def test_summary_reports_throughput_and_errors(self):
+        stats = Stats()
+        for _ in range(9):
+            stats.record("get_post", 0.01, ok=True)
+        stats.record("get_post", 0.5, ok=False)
+
+        summary = stats.summary(elapsed=2.0)
+        assert summary["rps"] == 5.0
+        assert summary["ops"]["get_post"]["count"] == 10
+        assert summary["ops"]["get_post"]["errors"] == 1
+        assert summary["ops"]["get_post"]["p99_ms"] == 500.0
+
+    def test_parse_mix(self):
+        assert parse_mix("get_post=70,list_posts=30") == {"get_post": 70, "list_posts": 30}
+
+
+class TestExplain:
+    """쿼리 실행 계획 점검 테스트"""
+
+    def sort_over_seq_scan(self):
+        return {
+            "Node Type": "Sort",
+            "Sort Key": ["created_at"],
+            "Plans": [{"Node Type": "Seq Scan", "Relation Name": "comments"}],
+        }
+
+    def test_flags_seq_scan_and_sort_on_large_table(self):
+        """큰 테이블의 순차 스캔과 정렬을 표시하고 인덱스 제안"""
+        shape = QueryShape("comments_by_post", None, "comments", ("post_id", "created_at"))
+        problems = find_problems(self.sort_over_seq_scan(), {"comments": 50_000}, shape)
+
+        assert problems == ["Sort on created_at", "Seq Scan on comments"]
+        assert shape.index_sql() == (
+            "CREATE INDEX IF NOT EXISTS idx_comments_post_id_created_at "
+            "ON comments (post_id, created_at)"
+        )
+
+    def test_ignores_small_tables_and_full_scans(self):
+        """작은 테이블이나 전체 조회 쿼리는 점검하지 않음"""
+        shape = QueryShape("comments_by_post", None, "comments")
+        assert find_problems(self.sort_over_seq_scan(), {"comments": 100}, shape) == []
+
+        full = QueryShape("post_list", None, "comments", full_scan=True)
+        assert find_problems(self.sort_over_seq_scan(), {"comments": 50_000}, full) == []
+
+    def test_suggested_indexes_match_schema_names(self):
+        """제안하는 인덱스 이름이 schema.sql의 같은 인덱스 이름과 같음 (--apply 중복 생성 방지)"""
+        schema = SCHEMA_PATH.read_text()
+        for shape in QUERY_SHAPES:
+            if shape.index is None:
+                continue
+            name = shape.index_sql().split()[5]
+            columns = ", ".join(shape.index)
+            assert f"CREATE INDEX {name} ON {shape.table}({columns})" in schema, shape.name
+
+    def test_query_shapes_build_sql(self):
+        """모든 쿼리 모양이 SQL을 만듦"""
+        params = {
+            "post_id": 1,
+            "post_ids": [1, 2],
+            "comment_id": 1,
+            "since": "2025-01-01T00:00:00+00:00",
+            "before_at": "2025-01-01T00:00:00+00:00",
+        }
+        for shape in QUERY_SHAPES:
+            query, _ = shape.build(params)
+            assert query.as_string(None).startswith("SELECT")
+
+    @pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+    def test_schema_indexes_cover_app_queries(self):
+        """데이터를 채운 DB에서 앱 쿼리가 순차 스캔/정렬 없이 실행됨"""
+        import psycopg
+
+        with psycopg.connect(TEST_DATABASE_URL, autocommit=True) as conn:
+            conn.execute(
+                "DROP TABLE IF EXISTS idempotency_keys, comment_tombstones, comments_archive, "
+                "posts_archive, comments, posts CASCADE"
+            )
+            conn.execute(SCHEMA_PATH.read_text())
+        seed(
+            TEST_DATABASE_URL,
+            posts=5000,
+            comments_per_post=4,
+            max_depth=5,
+            days=365,
+            max_views=10_000,
+        )
+
+        with psycopg.connect(TEST_DATABASE_URL, autocommit=True) as conn:
+            results = check(conn, min_rows=1000)
+
+        assert [r for r in results if r["problems"]] == []
@@ -0,0 +1,317 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from psycopg import sql
+
+import main
+from pg_database import PostgresQuery, PostgresRPC
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schema.sql"
+
+
+class FakeClient:
+    """실행된 SQL을 기록하는 클라이언트"""
+
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.executed = []
+
+    def fetch(self, query, params):
+        self.executed.append((query.as_string(None), params))
+        return self.rows
+
+
+class TestPostgresQuery:
+    """supabase 쿼리 빌더 호환 SQL 생성 테스트"""
+
+    def test_select_with_filter_and_order(self):
+        """목록/상세 조회 SQL"""
+        client = FakeClient()
+        PostgresQuery(client, "comments").select("id, content").eq("post_id", 1).order(
+            "created_at", desc=False
+        ).execute()
+
+        query, params = client.executed[0]
+        assert query == (
+            'SELECT "id", "content" FROM "comments" WHERE "post_id" = %s '
+            'ORDER BY "created_at" ASC'
+        )
+        assert params == [1]
+
+    def test_same_shape_produces_same_sql(self):
+        """값만 다른 쿼리는 같은 SQL(같은 prepared statement)을 사용"""
+        client = FakeClient()
+        PostgresQuery(client, "posts").select("id").eq("id", 1).execute()
+        PostgresQuery(client, "posts").select("id").eq("id", 2).execute()
+        PostgresQuery(client, "posts").select("id").in_("id", [1, 2, 3]).execute()
+        PostgresQuery(client, "posts").select("id").in_("id", [4]).execute()
+
+        assert client.executed[0][0] == client.executed[1][0]
+        assert client.executed[2][0] == client.executed[3][0]
+
+    def test_insert_returns_representation(self):
+        """INSERT는 생성된 행을 반환"""
+        client = FakeClient(rows=[{"id": 1}])
+        response = PostgresQuery(client, "posts").insert(
+            {"title": "제목", "content": "내용"}
+        ).execute()
+
+        query, params = client.executed[0]
+        assert query == (
+            'INSERT INTO "posts" ("title", "content") VALUES (%s, %s) RETURNING *'
+        )
+        assert params == ["제목", "내용"]
+        assert response.data == [{"id": 1}]
+
+    def test_update_with_filter(self):
+        """UPDATE SQL"""
+        client = FakeClient()
+        PostgresQuery(client, "posts").update({"view_count": 6}).eq("id", 1).execute()
+
+        query, params = client.executed[0]
+        assert query == 'UPDATE "posts" SET "view_count" = %s WHERE "id" = %s RETURNING *'
+        assert params == [6, 1]
+
+    def test_count_head_uses_count_query_only(self):
+        """count + head면 행은 가져오지 않고 개수만 조회"""
+        client = FakeClient(rows=[{"count": 7}])
+        response = PostgresQuery(client, "posts").select(
+            "id", count="exact", head=True
+        ).execute()
+
+        assert client.executed == [('SELECT count(*) AS count FROM "posts"', [])]
+        assert response.count == 7
+        assert response.data == []
+
+    def test_planned_count_uses_explain(self):
+        """planned count는 EXPLAIN의 예상 행 수 사용"""
+        client = FakeClient(rows=[{"QUERY PLAN": [{"Plan": {"Plan Rows": 1234.0}}]}])
+        response = PostgresQuery(client, "posts").select(
+            "id", count="planned", head=True
+        ).execute()
+
+        assert client.executed[0][0] == 'EXPLAIN (FORMAT JSON) SELECT 1 FROM "posts"'
+        assert response.count == 1234
+
+    def test_rpc_uses_named_arguments(self):
+        """함수 호출 SQL"""
+        client = FakeClient(rows=[{"result": 3}])
+        response = PostgresRPC(
+            client, "archive_old_posts", {"older_than_days": 30, "batch_size": 100}
+        ).execute()
+
+        query, params = client.executed[0]
+        assert query == (
+            'SELECT "archive_old_posts"("older_than_days" => %s, "batch_size" => %s) '
+            "AS result"
+        )
+        assert params == [30, 100]
+        assert response.data == 3
+
+    def test_rejects_invalid_identifier(self):
+        """식별자에 SQL이 섞이면 거부"""
+        with pytest.raises(ValueError):
+            PostgresQuery(FakeClient(), "posts; DROP TABLE posts")
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+class TestPostgresBackend:
+    """schema.sql로 만든 로컬 Postgres에 대한 API 테스트"""
+
+    @pytest.fixture
+    def pg_client(self):
+        import psycopg
+        from pg_database import PostgresClient
+
+        with psycopg.connect(TEST_DATABASE_URL, autocommit=True) as conn:
+            conn.execute(
+                "DROP TABLE IF EXISTS idempotency_keys, comment_tombstones, comments_archive, "
+                "posts_archive, comments, posts CASCADE"
+            )
+            conn.execute(SCHEMA_PATH.read_text())
+
+        pg = PostgresClient(TEST_DATABASE_URL)
+        with patch("main.get_supabase", return_value=pg):
+            yield pg
+        pg.close()
+
+    def test_post_and_comment_round_trip(self, client, pg_client):
+        """게시글/댓글 등록, 조회, 수정, 삭제"""
+        response = client.post(
+            "/api/posts",
+            json={"title": "제목", "content": "내용", "password": "1234"},
+        )
+        assert response.status_code == 201
+        post_id = response.json()["id"]
+
+        response = client.get(f"/api/posts/{post_id}")
+        assert response.status_code == 200
+        assert response.json()["title"] == "제목"
+        main.background_queue.flush()  # 조회수 증가 반영
+
+        response = client.put(
+            f"/api/posts/{post_id}",
+            json={"title": "수정", "content": "수정 내용", "password": "1234"},
+        )
+        assert response.status_code == 200
+        assert response.json()["view_count"] == 1
+
+        response = client.post(
+            f"/api/posts/{post_id}/comments",
+            json={"content": "댓글", "password": "1234"},
+        )
+        assert response.status_code == 201
+
+        response = client.get(f"/api/posts/{post_id}/comments")
+        assert [c["content"] for c in response.json()] == ["댓글"]
+
+        response = client.request(
+            "DELETE", f"/api/posts/{post_id}", json={"password": "1234"}
+        )
+        assert response.status_code == 204
+        assert client.get(f"/api/posts/{post_id}").status_code == 404
+
+    def test_archived_post_is_still_readable(self, client, pg_client):
+        """보관된 게시글과 댓글도 조회 가능 (목록에서는 빠지고 수정/삭제는 409)"""
+        from archive import archive_old_posts
+
+        post_id = client.post(
+            "/api/posts", json={"title": "오래된 글", "content": "내용", "password": "1234"}
+        ).json()["id"]
+        client.post(
+            f"/api/posts/{post_id}/comments", json={"content": "댓글", "password": "1234"}
+        )
+        pg_client.fetch(
+            sql.SQL(
+                "UPDATE posts SET created_at = NOW() - INTERVAL '400 days', "
+                "last_activity_at = NOW() - INTERVAL '400 days'"
+            ), []
+        )
+
+        assert archive_old_posts(pg_client, older_than_days=365, batch_size=10) == 1
+
+        assert client.get("/api/posts").json() == []
+        assert client.get(f"/api/posts/{post_id}").json()["title"] == "오래된 글"
+        comments = client.get(f"/api/posts/{post_id}/comments").json()
+        assert [c["content"] for c in comments] == ["댓글"]
+
+        # 보관된 게시글은 읽기 전용
+        response = client.put(
+            f"/api/posts/{post_id}",
+            json={"title": "수정", "content": "수정 내용", "password": "1234"},
+        )
+        assert response.status_code == 409
+        response = client.post(
+            f"/api/posts/{post_id}/comments", json={"content": "댓글", "password": "1234"}
+        )
+        assert response.status_code == 409
+        response = client.request(
+            "DELETE", f"/api/comments/{comments[0]['id']}", json={"password": "1234"}
+        )
+        assert response.status_code == 409
+
+    def test_comment_changes_include_cascaded_deletes(self, client, pg_client):
+        """대댓글까지 cascade 삭제되면 모두 삭제 id로 전달"""
+        post_id = client.post(
+            "/api/posts", json={"title": "제목", "content": "내용", "password": "1234"}
+        ).json()["id"]
+        parent = client.post(
+            f"/api/posts/{post_id}/comments", json={"content": "댓글", "password": "1234"}
+        ).json()
+        reply = client.post(
+            f"/api/posts/{post_id}/comments",
+            json={"content": "답글", "password": "1234", "parent_id": parent["id"]},
+        ).json()
+
+        since = parent["created_at"]
+        changes = client.get(
+            f"/api/posts/{post_id}/comments/changes", params={"since": since}
+        ).json()
+        assert {c["id"] for c in changes["comments"]} == {parent["id"], reply["id"]}
+
+        client.request("DELETE", f"/api/comments/{parent['id']}", json={"password": "1234"})
+        changes = client.get(
+            f"/api/posts/{post_id}/comments/changes", params={"since": changes["cursor"]}
+        ).json()
+        assert changes["comments"] == []
+        assert sorted(changes["deleted_ids"]) == sorted([parent["id"], reply["id"]])
+
+    def test_comment_changes_after_archive(self, client, pg_client):
+        """보관으로 옮긴 댓글은 삭제로 전달하지 않고 보관 테이블에서 조회"""
+        from archive import archive_old_posts
+
+        post_id = client.post(
+            "/api/posts", json={"title": "오래된 글", "content": "내용", "password": "1234"}
+        ).json()["id"]
+        kept, removed = (
+            client.post(
+                f"/api/posts/{post_id}/comments", json={"content": content, "password": "1234"}
+            ).json()
+            for content in ("남은 댓글", "삭제한 댓글")
+        )
+        client.request("DELETE", f"/api/comments/{removed['id']}", json={"password": "1234"})
+        pg_client.fetch(
+            sql.SQL(
+                "UPDATE posts SET created_at = NOW() - INTERVAL '400 days', "
+                "last_activity_at = NOW() - INTERVAL '400 days'"
+            ), []
+        )
+        assert archive_old_posts(pg_client, older_than_days=365, batch_size=10) == 1
+
+        changes = client.get(
+            f"/api/posts/{post_id}/comments/changes", params={"since": kept["created_at"]}
+        ).json()
+        assert [c["id"] for c in changes["comments"]] == [kept["id"]]
+        assert changes["deleted_ids"] == [removed["id"]]
+
+    def test_updated_at_is_set_by_database(self, client, pg_client):
+        """댓글 수정 시각은 DB가 기록하고 조회수/댓글 수 갱신은 게시글 수정 시각을 바꾸지 않음"""
+        post = client.post(
+            "/api/posts", json={"title": "제목", "content": "내용", "password": "1234"}
+        ).json()
+        comment = client.post(
+            f"/api/posts/{post['id']}/comments", json={"content": "댓글", "password": "1234"}
+        ).json()
+
+        updated = client.put(
+            f"/api/comments/{comment['id']}", json={"content": "수정", "password": "1234"}
+        ).json()
+        assert updated["updated_at"] > comment["updated_at"]
+        assert client.get(f"/api/posts/{post['id']}").json()["updated_at"] == post["updated_at"]
+
+    def test_idempotency_key_shared_between_workers(self, client, pg_client):
+        """다른 워커(저장소)로 간 재시도는 idempotency_keys 테이블의 응답을 재생"""
+        from idempotency import IdempotencyStore
+
+        first, second = (IdempotencyStore(get_client=lambda: pg_client) for _ in range(2))
+        created = first.run("posts", "abc", {"title": "제목"}, lambda: {"id": 1, "title": "제목"})
+        replayed = second.run("posts", "abc", {"title": "제목"}, lambda: {"id": 2})
+
+        assert created == ({"id": 1, "title": "제목"}, False)
+        assert replayed == ({"id": 1, "title": "제목"}, True)
+        assert first.prune() == 0
+
+    def test_activity_feed_orders_by_latest_comment(self, client, pg_client):
+        """댓글이 달린 오래된 게시글이 활동순 목록 앞으로 옴"""
+        ids = [
+            client.post(
+                "/api/posts", json={"title": title, "content": "내용", "password": "1234"}
+            ).json()["id"]
+            for title in ("첫 글", "둘째 글", "셋째 글")
+        ]
+        client.post(
+            f"/api/posts/{ids[0]}/comments", json={"content": "댓글", "password": "1234"}
+        )
+
+        first = client.get("/api/posts/activity", params={"limit": 2}).json()
+        assert [p["id"] for p in first["posts"]] == [ids[0], ids[2]]
+        assert first["posts"][0]["comment_count"] == 1
+
+        second = client.get(
+            "/api/posts/activity", params={"limit": 2, "cursor": first["next_cursor"]}
+        ).json()
+        assert [p["id"] for p in second["posts"]] == [ids[1]]
+        assert second["next_cursor"] is None
@@ -1,5 +1,10 @@
 import pytest
 from unittest.mock import patch, MagicMock
+import database
+import main
+from circuit import CircuitOpenError
+from idempotency import fingerprint
+from topology import HashPoolBusy
 
 
 class TestPostsAPI:
@@ -49,6 +54,62 @@ class TestPostsAPI:
             assert response.status_code == 200
             assert response.json() == []
 
+    # === 활동순 목록 테스트 ===
+    def test_get_posts_by_activity_returns_page_and_cursor(self, client):
+        """limit보다 많이 조회되면 마지막 게시글 기준 next_cursor 반환"""
+        rows = [
+            {
+                "id": post_id,
+                "title": f"글 {post_id}",
+                "content": "내용",
+                "author_name": "익명",
+                "view_count": 0,
+                "comment_count": 1,
+                "created_at": "2025-01-01T00:00:00+00:00",
+                "updated_at": "2025-01-01T00:00:00+00:00",
+                "last_activity_at": f"2025-01-0{post_id}T00:00:00+00:00",
+            }
+            for post_id in (3, 2, 1)
+        ]
+
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.rpc.return_value.execute.return_value.data = rows
+            mock_supabase.return_value = mock_client
+
+            response = client.get("/api/posts/activity", params={"limit": 2})
+            assert response.status_code == 200
+            data = response.json()
+            assert [p["id"] for p in data["posts"]] == [3, 2]
+            mock_client.rpc.assert_called_with(
+                "activity_feed", {"before_at": None, "before_id": None, "page_size": 3}
+            )
+
+            # 다음 페이지는 이전 페이지 마지막 게시글 이후부터
+            client.get(
+                "/api/posts/activity", params={"limit": 2, "cursor": data["next_cursor"]}
+            )
+            mock_client.rpc.assert_called_with(
+                "activity_feed",
+                {"before_at": "2025-01-02T00:00:00+00:00", "before_id": 2, "page_size": 3},
+            )
+
+    def test_get_posts_by_activity_last_page_has_no_cursor(self, client):
+        """마지막 페이지면 next_cursor는 null"""
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.rpc.return_value.execute.return_value.data = []
+            mock_supabase.return_value = mock_client
+
+            response = client.get("/api/posts/activity")
+
+            assert response.json() == {"posts": [], "next_cursor": None}
+
+    def test_get_posts_by_activity_invalid_cursor(self, client):
+        """잘못된 cursor면 400"""
+        response = client.get("/api/posts/activity", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
     # === 상세 조회 테스트 ===
     def test_get_post_success(self, client):
         """게시글 상세 조회 성공"""
@@ -77,12 +138,85 @@ class TestPostsAPI:
             mock_supabase.return_value = mock_client
 
             response = client.get("/api/posts/1")
+            client.get("/api/posts/1")
 
             assert response.status_code == 200
             data = response.json()
             assert data["id"] == 1
             assert data["title"] == "테스트 글"
 
+            # 조회수는 응답 후 배치로 합쳐서 반영
+            mock_client.table.return_value.update.assert_not_called()
+            main.background_queue.flush()
+            mock_client.rpc.assert_called_once_with(
+                "increment_view_counts", {"post_ids": [1], "increments": [2]}
+            )
+
+    def test_get_post_serves_stale_when_database_unavailable(self, client):
+        """DB 장애 시 마지막으로 조회한 게시글을 stale 표시와 함께 반환"""
+        post = {
+            "id": 1,
+            "title": "테스트 글",
+            "content": "테스트 내용",
+            "author_name": "테스터",
+            "view_count": 5,
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "updated_at": "2025-01-01T00:00:00+00:00",
+        }
+
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            select = mock_client.table.return_value.select.return_value.eq.return_value
+            select.execute.return_value.data = [post]
+            mock_supabase.return_value = mock_client
+            assert client.get("/api/posts/1").status_code == 200
+
+            select.execute.side_effect = CircuitOpenError()
+            response = client.get("/api/posts/1")
+
+            assert response.status_code == 200
+            assert response.json()["title"] == "테스트 글"
+            assert response.headers["Served-Stale"] == "true"
+            # 첫 조회의 조회수 증가 + 갱신 예약 (stale 응답은 조회수를 세지 않음)
+            assert main.background_queue.stats()["depth"] == 2
+
+    def test_get_post_does_not_hide_code_errors_behind_stale(self, client):
+        """DB 장애가 아닌 오류는 마지막 결과로 가리지 않음"""
+        post = {
+            "id": 1,
+            "title": "테스트 글",
+            "content": "테스트 내용",
+            "author_name": "테스터",
+            "view_count": 5,
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "updated_at": "2025-01-01T00:00:00+00:00",
+        }
+
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            select = mock_client.table.return_value.select.return_value.eq.return_value
+            select.execute.return_value.data = [post]
+            mock_supabase.return_value = mock_client
+            assert client.get("/api/posts/1").status_code == 200
+
+            select.execute.side_effect = KeyError("title")
+            with pytest.raises(KeyError):
+                client.get("/api/posts/1")
+
+    def test_get_post_without_stale_copy_returns_503(self, client):
+        """마지막 결과가 없으면 회로 차단 시 503"""
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.table.return_value.select.return_value.eq.return_value.execute.side_effect = (
+                CircuitOpenError()
+            )
+            mock_supabase.return_value = mock_client
+
+            response = client.get("/api/posts/1")
+
+            assert response.status_code == 503
+            assert "Retry-After" in response.headers
+
     def test_get_post_not_found(self, client):
         """존재하지 않는 게시글 조회 시 404"""
         with patch("main.get_supabase") as mock_supabase:
@@ -97,6 +231,108 @@ class TestPostsAPI:
             assert response.status_code == 404
             assert response.json()["detail"] == "Post not found"
 
+    def test_get_post_falls_back_to_archive(self, client):
+        """최근 테이블에 없는 게시글은 보관 테이블에서 조회 (조회수 증가 없음)"""
+        archived = [
+            {
+                "id": 1,
+                "title": "오래된 글",
+                "content": "내용",
+                "author_name": "익명",
+                "view_count": 3,
+                "created_at": "2020-01-01T00:00:00+00:00",
+                "updated_at": "2020-01-01T00:00:00+00:00",
+            }
+        ]
+        tables = {"posts": MagicMock(), "posts_archive": MagicMock()}
+        tables["posts"].select.return_value.eq.return_value.execute.return_value.data = []
+        tables["posts_archive"].select.return_value.eq.return_value.execute.return_value.data = (
+            archived
+        )
+
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.table.side_effect = lambda name: tables[name]
+            mock_supabase.return_value = mock_client
+
+            response = client.get("/api/posts/1")
+
+            assert response.status_code == 200
+            assert response.json()["title"] == "오래된 글"
+            tables["posts"].update.assert_not_called()
+
+    # === 일괄 조회 테스트 ===
+    def test_get_posts_batch_returns_in_request_order(self, client):
+        """여러 게시글을 한 번에 요청 순서대로 조회하고 조회수는 올리지 않음"""
+        mock_data = [
+            {
+                "id": post_id,
+                "title": f"글 {post_id}",
+                "content": "내용",
+                "author_name": "익명",
+                "view_count": 0,
+                "created_at": "2025-01-01T00:00:00+00:00",
+                "updated_at": "2025-01-01T00:00:00+00:00",
+            }
+            for post_id in (1, 2, 3)
+        ]
+
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.table.return_value.select.return_value.in_.return_value.execute.return_value.data = (
+                mock_data
+            )
+            mock_supabase.return_value = mock_client
+
+            response = client.get("/api/posts/batch?ids=3&ids=1&ids=2&ids=3")
+
+            assert response.status_code == 200
+            assert [post["id"] for post in response.json()] == [3, 1, 2]
+            mock_client.table.return_value.select.return_value.in_.assert_called_once_with(
+                "id", [3, 1, 2]
+            )
+            mock_client.table.return_value.update.assert_not_called()
+
+    def test_get_posts_batch_too_many_ids(self, client):
+        """최대 개수를 넘으면 400"""
+        query = "&".join(f"ids={i}" for i in range(1, 52))
+        with patch("main.get_supabase"):
+            response = client.get(f"/api/posts/batch?{query}")
+
+        assert response.status_code == 400
+
+    # === 전체 개수 테스트 ===
+    def test_get_posts_count_exact_for_small_table(self, client):
+        """추정치가 임계값보다 작으면 정확한 개수"""
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.table.return_value.select.return_value.execute.side_effect = [
+                MagicMock(count=40),  # planned
+                MagicMock(count=42),  # exact
+            ]
+            mock_supabase.return_value = mock_client
+
+            response = client.get("/api/posts/count")
+
+            assert response.status_code == 200
+            assert response.json() == {"total": 42, "estimated": False}
+
+    def test_get_posts_count_estimated_for_large_table_and_cached(self, client):
+        """추정치가 임계값 이상이면 추정치를 쓰고, 결과는 캐시"""
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.table.return_value.select.return_value.execute.return_value.count = (
+                5_000_000
+            )
+            mock_supabase.return_value = mock_client
+
+            first = client.get("/api/posts/count")
+            second = client.get("/api/posts/count")
+
+            assert first.json() == {"total": 5_000_000, "estimated": True}
+            assert second.json() == first.json()
+            assert mock_client.table.return_value.select.return_value.execute.call_count == 1
+
     # === 등록 테스트 ===
     def test_create_post_success(self, client):
         """게시글 등록 성공"""
@@ -129,8 +365,44 @@ class TestPostsAPI:
             assert response.status_code == 201
             data = response.json()
             assert data["title"] == "새 글"
+            assert data["content_html"] == "<p>새 내용</p>"
             assert "password" not in data  # 비밀번호는 응답에 포함되지 않음
 
+            # 렌더링한 HTML을 함께 저장
+            inserted = mock_client.table.return_value.insert.call_args[0][0]
+            assert inserted["content_html"] == "<p>새 내용</p>"
+
+    def test_create_post_when_hash_pool_busy(self, client):
+        """비밀번호 해시 대기열이 차면 저장하지 않고 바로 503"""
+        with patch("main.get_supabase") as mock_supabase, patch(
+            "main.run_in_hash_pool", side_effect=HashPoolBusy()
+        ):
+            mock_client = MagicMock()
+            mock_supabase.return_value = mock_client
+
+            response = client.post(
+                "/api/posts",
+                json={"title": "새 글", "content": "새 내용", "password": "1234"},
+            )
+
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+            mock_client.table.return_value.insert.assert_not_called()
+
+    def test_create_post_fails_fast_when_circuit_open(self, client):
+        """DB 회로 차단 중이면 해시/DB 호출 없이 바로 503"""
+        with patch("main.get_supabase") as mock_supabase, patch.object(
+            database.breaker, "is_open", return_value=True
+        ), patch("main.bcrypt") as mock_bcrypt:
+            response = client.post(
+                "/api/posts",
+                json={"title": "새 글", "content": "새 내용", "password": "1234"},
+            )
+
+            assert response.status_code == 503
+            mock_bcrypt.hashpw.assert_not_called()
+            mock_supabase.return_value.table.assert_not_called()
+
     def test_create_post_with_author_name(self, client):
         """작성자명을 지정한 게시글 등록"""
         mock_created = {
@@ -179,6 +451,100 @@ class TestPostsAPI:
         )
         assert response.status_code == 422
 
+    def test_create_post_replays_response_for_same_idempotency_key(self, client):
+        """같은 Idempotency-Key로 재시도하면 다시 저장하지 않고 이전 응답 재생"""
+        mock_created = {
+            "id": 1,
+            "title": "새 글",
+            "content": "새 내용",
+            "author_name": "익명",
+            "view_count": 0,
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "updated_at": "2025-01-01T00:00:00+00:00",
+        }
+        body = {"title": "새 글", "content": "새 내용", "password": "1234"}
+
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            # idempotency_keys 테이블에서 키를 새로 선점
+            mock_client.rpc.return_value.execute.return_value.data = None
+            mock_client.table.return_value.insert.return_value.execute.return_value.data = [
+                mock_created
+            ]
+            mock_supabase.return_value = mock_client
+
+            first = client.post("/api/posts", json=body, headers={"Idempotency-Key": "abc"})
+            second = client.post("/api/posts", json=body, headers={"Idempotency-Key": "abc"})
+
+            assert first.status_code == second.status_code == 201
+            assert first.json() == second.json()
+            assert "Idempotent-Replayed" not in first.headers
+            assert second.headers["Idempotent-Replayed"] == "true"
+            assert mock_client.table.return_value.insert.call_count == 1
+
+    def test_create_post_idempotency_key_reused_with_different_body(self, client):
+        """같은 Idempotency-Key를 다른 내용으로 재사용하면 422"""
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            # idempotency_keys 테이블에서 키를 새로 선점
+            mock_client.rpc.return_value.execute.return_value.data = None
+            mock_client.table.return_value.insert.return_value.execute.return_value.data = [
+                {
+                    "id": 1,
+                    "title": "새 글",
+                    "content": "새 내용",
+                    "author_name": "익명",
+                    "view_count": 0,
+                    "created_at": "2025-01-01T00:00:00+00:00",
+                    "updated_at": "2025-01-01T00:00:00+00:00",
+                }
+            ]
+            mock_supabase.return_value = mock_client
+
+            headers = {"Idempotency-Key": "abc"}
+            client.post(
+                "/api/posts",
+                json={"title": "새 글", "content": "새 내용", "password": "1234"},
+                headers=headers,
+            )
+            response = client.post(
+                "/api/posts",
+                json={"title": "다른 글", "content": "새 내용", "password": "1234"},
+                headers=headers,
+            )
+
+            assert response.status_code == 422
+
+    def test_create_post_idempotency_hash_excludes_password(self, client):
+        """idempotency_keys에 저장되는 요청 해시에는 비밀번호를 넣지 않음"""
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.rpc.return_value.execute.return_value.data = None
+            mock_client.table.return_value.insert.return_value.execute.return_value.data = [
+                {
+                    "id": 1,
+                    "title": "새 글",
+                    "content": "새 내용",
+                    "author_name": "익명",
+                    "view_count": 0,
+                    "created_at": "2025-01-01T00:00:00+00:00",
+                    "updated_at": "2025-01-01T00:00:00+00:00",
+                }
+            ]
+            mock_supabase.return_value = mock_client
+
+            client.post(
+                "/api/posts",
+                json={"title": "새 글", "content": "새 내용", "password": "1234"},
+                headers={"Idempotency-Key": "abc"},
+            )
+
+            claim = mock_client.rpc.call_args_list[0]
+            assert claim.args[0] == "claim_idempotency_key"
+            assert claim.args[1]["payload_hash"] == fingerprint(
+                {"title": "새 글", "content": "새 내용", "author_name": "익명"}
+            )
+
     # === 수정 테스트 ===
     def test_update_post_success(self, client):
         """게시글 수정 성공"""
@@ -270,6 +636,27 @@ class TestPostsAPI:
 
             assert response.status_code == 404
 
+    def test_update_archived_post_is_read_only(self, client):
+        """보관된 게시글 수정은 409 (읽기 전용)"""
+        tables = {"posts": MagicMock(), "posts_archive": MagicMock()}
+        tables["posts"].select.return_value.eq.return_value.execute.return_value.data = []
+        tables["posts_archive"].select.return_value.eq.return_value.execute.return_value.data = [
+            {"id": 1}
+        ]
+
+        with patch("main.get_supabase") as mock_supabase:
+            mock_client = MagicMock()
+            mock_client.table.side_effect = lambda name: tables[name]
+            mock_supabase.return_value = mock_client
+
+            response = client.put(
+                "/api/posts/1",
+                json={"title": "수정된 제목", "content": "수정된 내용", "password": "1234"},
+            )
+
+            assert response.status_code == 409
+            tables["posts"].update.assert_not_called()
+
     # === 삭제 테스트 ===
     def test_delete_post_success(self, client):
         """게시글 삭제 성공"""
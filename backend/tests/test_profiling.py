@@ -0,0 +1,109 @@
+import pstats
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import profiling
+from profiling import CProfileProfiler, RequestProfiler, ProfiledRoute, ProfilingMiddleware
+
+
+def busy_work():
+    return sum(i * i for i in range(20000))
+
+
+def make_client(tmp_path, **options):
+    app = FastAPI()
+    app.router.route_class = ProfiledRoute
+    app.add_middleware(ProfilingMiddleware, output_dir=str(tmp_path), **options)
+
+    @app.get("/api/posts/{post_id}")
+    def get_post(post_id: int):
+        busy_work()
+        time.sleep(0.01)
+        return {"id": post_id}
+
+    return TestClient(app)
+
+
+class TestProfiling:
+    """요청 프로파일링 미들웨어 테스트"""
+
+    def test_not_profiled_by_default(self, tmp_path):
+        """샘플링 비율 0이고 토큰이 없으면 프로파일하지 않음"""
+        client = make_client(tmp_path, sample_rate=0, token=None)
+        response = client.get("/api/posts/1")
+
+        assert response.json() == {"id": 1}
+        assert list(tmp_path.iterdir()) == []
+
+    def test_profiled_with_authorized_header(self, tmp_path):
+        """올바른 X-Profile-Token 헤더가 있으면 핸들러를 cProfile로 기록"""
+        client = make_client(tmp_path, sample_rate=0, token="secret")
+        response = client.get("/api/posts/1", headers={"X-Profile-Token": "secret"})
+
+        assert response.json() == {"id": 1}
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1
+        assert "GET-api_posts_post_id" in files[0].name
+        assert files[0].suffix == ".prof"
+        functions = {func[2] for func in pstats.Stats(str(files[0])).stats}
+        assert "busy_work" in functions
+
+    def test_wrong_token_is_ignored(self, tmp_path):
+        """토큰이 틀리면 프로파일하지 않음"""
+        client = make_client(tmp_path, sample_rate=0, token="secret")
+        client.get("/api/posts/1", headers={"X-Profile-Token": "wrong"})
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_sampling_profiler_writes_folded_stacks(self, tmp_path):
+        """sample 모드는 flamegraph용 collapsed stack 파일 생성"""
+        client = make_client(tmp_path, sample_rate=1, mode="sample")
+        client.get("/api/posts/1")
+
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1
+        assert files[0].suffix == ".folded"
+        lines = files[0].read_text().splitlines()
+        assert lines
+        assert any("get_post" in line for line in lines)
+
+    def test_skips_while_another_request_is_profiled(self, tmp_path):
+        """다른 요청을 프로파일링 중이면 건너뛰고 정상 응답"""
+        client = make_client(tmp_path, sample_rate=1)
+        with profiling._profile_lock:
+            response = client.get("/api/posts/1")
+
+        assert response.json() == {"id": 1}
+        assert list(tmp_path.iterdir()) == []
+
+    def test_profiler_errors_do_not_fail_request(self, tmp_path):
+        """프로파일러 시작/저장이 실패해도 요청은 성공"""
+
+        class BrokenProfiler(CProfileProfiler):
+            def enable(self):
+                raise ValueError("Another profiling tool is already active")
+
+            def dump(self, path):
+                raise OSError("disk full")
+
+        client = make_client(tmp_path, sample_rate=1)
+        with patch.object(ProfilingMiddleware, "_new_profiler", lambda self: BrokenProfiler()):
+            response = client.get("/api/posts/1")
+
+        assert response.status_code == 200
+        assert response.json() == {"id": 1}
+        assert not profiling._profile_lock.locked()
+
+    def test_profiler_must_implement_all_methods(self):
+        """메서드를 빠뜨린 프로파일러는 생성할 때 실패"""
+
+        class Incomplete(RequestProfiler):
+            def enable(self):
+                pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
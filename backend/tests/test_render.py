@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+from render import HTMLRenderer, render_html
+
+
+class TestRenderHTML:
+    """본문 HTML 렌더링 테스트"""
+
+    def test_escapes_markup(self):
+        """태그와 속성은 모두 escape"""
+        rendered = render_html('<script>alert("x")</script><img src=x onerror=alert(1)>')
+        assert "<script>" not in rendered
+        assert "<img" not in rendered
+        assert "&lt;script&gt;" in rendered
+
+    def test_paragraphs_and_line_breaks(self):
+        """빈 줄은 문단, 줄바꿈은 <br>"""
+        assert render_html("첫 줄\n둘째 줄\n\n다음 문단") == (
+            "<p>첫 줄<br>둘째 줄</p><p>다음 문단</p>"
+        )
+
+    def test_links_urls_only(self):
+        """http(s) URL만 링크로 만들고 끝의 문장부호는 제외"""
+        rendered = render_html("참고: https://example.com/a?b=1&c=2. javascript:alert(1)")
+        assert rendered == (
+            '<p>참고: <a href="https://example.com/a?b=1&amp;c=2" '
+            'rel="nofollow noopener noreferrer">https://example.com/a?b=1&amp;c=2</a>'
+            ". javascript:alert(1)</p>"
+        )
+
+
+class TestHTMLRenderer:
+    """본문 해시별 렌더링 캐시 테스트"""
+
+    def test_same_content_is_rendered_once(self):
+        renderer = HTMLRenderer()
+        with patch("render.render_html", return_value="<p>x</p>") as mock_render:
+            assert renderer.render("x") == "<p>x</p>"
+            assert renderer.render("x") == "<p>x</p>"
+            renderer.render("y")
+
+        assert mock_render.call_count == 2
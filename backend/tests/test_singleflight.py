@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """동시 조회 요청 합치기 테스트"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """같은 키로 동시에 호출하면 한 번만 실행하고 결과 공유"""
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return {"id": 1}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("post:1", fetch)))
+        leader.start()
+        started.wait()
+
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("post:1", fetch)))
+            for _ in range(5)
+        ]
+        for t in followers:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in [leader, *followers]:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [{"id": 1}] * 6
+
+    def test_different_keys_run_independently(self):
+        """키가 다르면 각각 실행"""
+        flight = SingleFlight()
+        assert flight.do("post:1", lambda: 1) == 1
+        assert flight.do("post:2", lambda: 2) == 2
+
+    def test_sequential_calls_are_not_cached(self):
+        """진행 중인 호출이 끝나면 다음 호출은 새로 실행"""
+        flight = SingleFlight()
+        calls = []
+        flight.do("post:1", lambda: calls.append(1))
+        flight.do("post:1", lambda: calls.append(1))
+        assert len(calls) == 2
+
+    def test_error_is_propagated_and_key_released(self):
+        """실패한 호출의 예외를 전파하고 키를 해제"""
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            flight.do("post:1", fail)
+        assert flight.do("post:1", lambda: "ok") == "ok"
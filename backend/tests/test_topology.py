@@ -0,0 +1,73 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from topology import HashPoolBusy, cgroup_cpu_limit, plan, run_in_hash_pool
+from tracing import Trace, current_trace
+
+
+class TestTopology:
+    """워커/스레드 구성 계산 테스트"""
+
+    def test_plan_uses_one_worker_per_core(self):
+        """코어당 워커 하나, 해시 슬롯 합은 코어 수"""
+        chosen = plan(cores=8, hash_ms=250, db_pool_size=20)
+
+        assert chosen["workers"] == 8
+        assert chosen["hash_pool_size"] == 1
+        # 1초 안에 처리할 수 있는 만큼(250ms x 4) 대기, 그래도 DB 연결 수만큼 스레드가 남음
+        assert chosen["hash_queue_size"] == 4
+        assert chosen["threadpool_size"] == 25
+        assert chosen["max_hashes_per_second"] == 32.0
+
+    def test_plan_with_fewer_workers_gives_larger_hash_pools(self):
+        """워커 수를 줄이면 워커별 해시 풀이 커짐"""
+        chosen = plan(cores=8, hash_ms=250, db_pool_size=20, workers=2)
+
+        assert chosen["hash_pool_size"] == 4
+        assert chosen["hash_queue_size"] == 16
+        assert chosen["threadpool_size"] == 40
+        assert chosen["max_hashes_per_second"] == 32.0
+
+    def test_cgroup_cpu_limit(self, tmp_path):
+        """cgroup v2 cpu.max에서 CPU 제한 계산"""
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("200000 100000\n")
+        assert cgroup_cpu_limit(str(cpu_max)) == 2.0
+
+        cpu_max.write_text("max 100000\n")
+        assert cgroup_cpu_limit(str(cpu_max)) is None
+        assert cgroup_cpu_limit(str(tmp_path / "missing")) is None
+
+    def test_hash_pool_keeps_request_context(self):
+        """해시 스레드에서도 현재 요청의 trace context 유지"""
+        trace = Trace()
+        token = current_trace.set(trace)
+        try:
+            seen, thread = run_in_hash_pool(
+                lambda: (current_trace.get(), threading.current_thread().name)
+            )
+        finally:
+            current_trace.reset(token)
+
+        assert seen is trace
+        assert thread.startswith("hash")
+
+    def test_plan_keeps_one_queued_hash_per_slot_when_hash_is_slow(self):
+        """해시가 max_wait_ms보다 오래 걸려도 슬롯당 하나는 대기할 수 있음"""
+        chosen = plan(cores=4, hash_ms=1500, db_pool_size=10)
+
+        assert chosen["hash_queue_size"] == 1
+        assert chosen["threadpool_size"] == 12
+
+    def test_hash_pool_rejects_when_queue_is_full(self):
+        """해시 실행 + 대기 수가 한도에 차면 스레드를 잡고 기다리지 않고 HashPoolBusy"""
+        slots = threading.BoundedSemaphore(1)
+        with patch("topology._hash_slots", slots):
+            slots.acquire()
+            with pytest.raises(HashPoolBusy):
+                run_in_hash_pool(lambda: "hashed")
+            slots.release()
+
+            assert run_in_hash_pool(lambda: "hashed") == "hashed"
@@ -0,0 +1,141 @@
+import os
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from supabase_client import PooledTransport
+import tracing
+from tracing import Exporter, Trace, TracedRoute, TracingMiddleware, span
+
+
+class MemoryExporter(Exporter):
+    """내보낸 payload를 메모리에 보관"""
+
+    def __init__(self):
+        self.payloads = []
+        super().__init__()
+
+    def export(self, payload):
+        self.payloads.append(payload)
+
+
+def spans_of(payload):
+    spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    for s in spans:
+        s["attrs"] = {a["key"]: a["value"]["stringValue"] for a in s["attributes"]}
+    return {s["name"]: s for s in spans}
+
+
+def make_client(exporter):
+    app = FastAPI()
+    app.router.route_class = TracedRoute
+    app.add_middleware(TracingMiddleware, exporter=exporter, sample_rate=1)
+
+    transport = PooledTransport(
+        httpx.MockTransport(lambda request: httpx.Response(200, json=[])), pool_size=1
+    )
+
+    @app.put("/api/posts/{post_id}")
+    def update_post(post_id: int):
+        with span("bcrypt.check"):
+            pass
+        with httpx.Client(transport=transport) as client:
+            client.get("http://test/rest/v1/posts", params={"id": f"eq.{post_id}"})
+        return {"id": post_id}
+
+    return TestClient(app)
+
+
+class TestTracing:
+    """요청 트레이싱 테스트"""
+
+    def test_request_produces_nested_spans(self):
+        """라우트, 핸들러, DB 호출, 해시, 직렬화 span이 한 trace로 기록"""
+        exporter = MemoryExporter()
+        client = make_client(exporter)
+
+        response = client.put("/api/posts/7")
+        exporter.flush()
+
+        assert response.status_code == 200
+        assert len(exporter.payloads) == 1
+        spans = spans_of(exporter.payloads[0])
+        root = spans["PUT /api/posts/{post_id}"]
+        handler = spans["handler"]
+        postgrest = spans["postgrest"]
+
+        assert root["attrs"]["http.status_code"] == "200"
+        assert "parentSpanId" not in root
+        assert handler["parentSpanId"] == root["spanId"]
+        assert spans["bcrypt.check"]["parentSpanId"] == handler["spanId"]
+        assert postgrest["parentSpanId"] == handler["spanId"]
+        assert postgrest["attrs"]["db.table"] == "posts"
+        assert postgrest["attrs"]["db.filter"] == "id=eq.7"
+        assert spans["serialize"]["parentSpanId"] == root["spanId"]
+        assert len({s["traceId"] for s in spans.values()}) == 1
+
+    def test_disabled_without_exporter(self):
+        """exporter가 없으면 추적하지 않음"""
+        client = make_client(None)
+        assert client.put("/api/posts/7").status_code == 200
+
+    def test_span_outside_request_is_noop(self):
+        """요청 밖에서는 span이 아무것도 기록하지 않음"""
+        with span("bcrypt.hash") as s:
+            assert s is None
+
+    def test_exporter_must_implement_export(self):
+        """export를 구현하지 않은 exporter는 생성할 때 실패"""
+
+        class Incomplete(Exporter):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_exporter_thread_starts_on_first_submit(self):
+        """import 시점(pre-fork 부모)에는 스레드를 만들지 않고 처음 submit할 때 시작"""
+        exporter = MemoryExporter()
+        assert exporter._thread is None
+
+        exporter.submit(Trace())
+        exporter.flush()
+        assert len(exporter.payloads) == 1
+
+    def test_exporter_restarts_after_fork(self):
+        """fork된 자식은 부모의 큐를 버리고 자기 스레드로 내보냄"""
+        exporter = MemoryExporter()
+        exporter.submit(Trace())
+        exporter.flush()
+        parent_thread = exporter._thread
+
+        tracing._reset_exporters_after_fork()
+        assert exporter._thread is None
+
+        exporter.submit(Trace())
+        exporter.flush()
+        assert exporter._thread is not parent_thread
+        assert len(exporter.payloads) == 2
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="fork not available")
+    def test_exporter_exports_in_forked_child(self):
+        """실제로 fork한 자식에서도 trace를 내보냄"""
+        exporter = MemoryExporter()
+        exporter.submit(Trace())
+        exporter.flush()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                exporter.submit(Trace())
+                exporter.flush()
+                os.write(write_fd, str(len(exporter.payloads)).encode())
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        assert os.read(read_fd, 16) == b"2"
+        os.close(read_fd)
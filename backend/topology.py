@@ -0,0 +1,118 @@
+import contextvars
+import math
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+# serve.py가 워커마다 설정 (0이면 코어 수 / anyio 기본값)
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", "0")) or (os.cpu_count() or 1)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "0"))
+# 해시 풀이 찬 뒤 기다릴 수 있는 요청 수 (넘으면 503, 기본은 슬롯당 4개 = 기본 cost로 약 1초)
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", "0")) or HASH_POOL_SIZE * 4
+# plan()이 해시 대기열 크기를 정할 때 허용하는 최대 대기 시간(ms)
+HASH_MAX_WAIT_MS = float(os.getenv("HASH_MAX_WAIT_MS", "1000"))
+
+# bcrypt 해시는 CPU를 쓰므로 코어 수 이상 동시에 실행하지 않음 (나머지는 대기)
+hash_pool = ThreadPoolExecutor(max_workers=HASH_POOL_SIZE, thread_name_prefix="hash")
+# 해시를 기다리는 요청도 스레드풀 스레드를 잡고 있으므로 실행 + 대기 수를 제한
+_hash_slots = threading.BoundedSemaphore(HASH_POOL_SIZE + HASH_QUEUE_SIZE)
+
+
+class HashPoolBusy(Exception):
+    """해시 풀과 대기열이 모두 참"""
+
+
+def run_in_hash_pool(fn: Callable[[], T]) -> T:
+    """fn을 해시 전용 스레드에서 실행하고 결과를 기다림 (trace 등 context 유지)
+
+    대기열까지 차 있으면 기다리지 않고 HashPoolBusy (읽기 요청이 쓸 스레드를 남겨 둠)
+    """
+    if not _hash_slots.acquire(blocking=False):
+        raise HashPoolBusy()
+    try:
+        return hash_pool.submit(contextvars.copy_context().run, fn).result()
+    finally:
+        _hash_slots.release()
+
+
+def configure_threadpool(size: int = THREADPOOL_SIZE) -> None:
+    """sync 핸들러를 실행하는 anyio 스레드풀 크기 설정 (이벤트 루프 안에서 호출)"""
+    if size > 0:
+        import anyio.to_thread
+
+        anyio.to_thread.current_default_thread_limiter().total_tokens = size
+
+
+def cgroup_cpu_limit(path: str = CGROUP_CPU_MAX) -> float | None:
+    """컨테이너 CPU 제한 (cgroup v2 cpu.max, 제한이 없으면 None)"""
+    try:
+        with open(path) as f:
+            quota, period = f.read().split()
+    except (OSError, ValueError):
+        return None
+    if quota == "max":
+        return None
+    return int(quota) / int(period)
+
+
+def available_cores() -> int:
+    """이 프로세스가 실제로 쓸 수 있는 코어 수 (CPU affinity, 컨테이너 제한 반영)"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cores = min(cores, max(1, math.floor(limit)))
+    return cores
+
+
+def measure_hash_ms(samples: int = 3) -> float:
+    """기본 cost로 bcrypt 해시 한 번에 걸리는 시간(ms, 중앙값)"""
+    import bcrypt
+
+    durations = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.hashpw(b"measure", bcrypt.gensalt())
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations)
+
+
+def plan(
+    cores: int,
+    hash_ms: float,
+    db_pool_size: int,
+    workers: int | None = None,
+    max_wait_ms: float = HASH_MAX_WAIT_MS,
+) -> dict:
+    """코어 수와 해시 비용으로 워커/스레드 구성 계산
+
+    - 워커 프로세스: 코어당 하나 (JSON 직렬화, 검증 등 GIL을 잡는 작업을 병렬로)
+    - 해시 풀: 전체 워커 합이 코어 수가 되도록 (bcrypt는 GIL을 놓고 CPU를 씀)
+    - 해시 대기열: max_wait_ms 안에 처리할 수 있는 만큼 (넘는 쓰기 요청은 503)
+    - 스레드풀: DB 연결 수 + 해시 슬롯 + 해시 대기열 (해시를 기다리는 쓰기 요청이 모두
+      스레드를 잡고 있어도 읽기와 /health가 쓸 DB 연결 수만큼은 남음)
+    """
+    workers = workers or cores
+    hash_pool_size = max(1, cores // workers)
+    hash_queue_size = hash_pool_size * max(1, math.floor(max_wait_ms / hash_ms))
+    threadpool_size = db_pool_size + hash_pool_size + hash_queue_size
+    hash_slots = workers * hash_pool_size
+    return {
+        "cores": cores,
+        "workers": workers,
+        "threadpool_size": threadpool_size,
+        "hash_pool_size": hash_pool_size,
+        "hash_queue_size": hash_queue_size,
+        "hash_ms": round(hash_ms, 1),
+        # 모든 해시 슬롯이 쉬지 않을 때 초당 처리 가능한 등록/수정/삭제 수
+        "max_hashes_per_second": round(hash_slots * 1000 / hash_ms, 1),
+    }
@@ -0,0 +1,330 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+# 내보내기 방식: "" (비활성) | file (JSON lines) | otlp (OTLP/HTTP JSON)
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "")
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1"))
+SERVICE_NAME = "ai-board-api"
+
+
+class Span:
+    """시간 구간 하나"""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: str | None = None,
+        attributes: dict[str, Any] | None = None,
+        start_ns: int | None = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes or {}
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: int | None = None
+
+    def end(self, end_ns: int | None = None) -> None:
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in self.attributes.items()
+            ],
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Trace:
+    """요청 하나에서 생긴 span 모음"""
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[Span] = []
+        self.handler_end_ns: int | None = None
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_otlp(self) -> dict:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": SERVICE_NAME},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [s.to_otlp() for s in self.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """현재 요청이 추적 중이면 하위 span 기록 (아니면 아무 일도 하지 않음)"""
+    trace = current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = current_span.get()
+    s = Span(name, trace.trace_id, parent.span_id if parent else None, attributes)
+    reset_token = current_span.set(s)
+    try:
+        yield s
+    except Exception as e:
+        s.attributes["error"] = repr(e)
+        raise
+    finally:
+        s.end()
+        current_span.reset(reset_token)
+        trace.add(s)
+
+
+# fork된 자식에서 초기화할 exporter (스레드는 fork 후 자식에 남지 않음)
+_exporters: "weakref.WeakSet[Exporter]" = weakref.WeakSet()
+
+
+def _reset_exporters_after_fork() -> None:
+    for exporter in list(_exporters):
+        exporter._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_exporters_after_fork)
+
+
+class Exporter(ABC):
+    """완료된 trace를 백그라운드 스레드에서 내보냄 (큐가 차면 버림)
+
+    스레드는 처음 submit할 때 시작하므로 import 시점이나 pre-fork 서버의 부모에서
+    만들어도 각 워커가 자기 스레드를 가짐.
+    """
+
+    def __init__(self, max_queue: int = 1000):
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._reset()
+        _exporters.add(self)
+
+    def _reset(self) -> None:
+        """부모의 큐(이미 내보낼 trace)와 스레드를 버리고 처음 상태로"""
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[Trace] = queue.Queue(maxsize=self.max_queue)
+        self._thread: threading.Thread | None = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,), name="trace-exporter", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, trace: Trace) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self, traces: "queue.Queue[Trace]") -> None:
+        while True:
+            trace = traces.get()
+            try:
+                self.export(trace.to_otlp())
+            except Exception as e:
+                logger.warning("Trace export failed: %s", e)
+            finally:
+                traces.task_done()
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    @abstractmethod
+    def export(self, payload: dict) -> None: ...
+
+
+class FileExporter(Exporter):
+    """OTLP JSON payload를 한 줄씩 파일에 기록"""
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        super().__init__(**kwargs)
+
+    def export(self, payload: dict) -> None:
+        with open(self.path, "a") as f:
+            f.write(json.dumps(payload) + "\n")
+
+
+class OTLPHttpExporter(Exporter):
+    """OTLP/HTTP JSON으로 수집기에 전송"""
+
+    def __init__(self, endpoint: str, **kwargs):
+        self.endpoint = endpoint
+        super().__init__(**kwargs)
+
+    def _reset(self) -> None:
+        import httpx
+
+        # 부모의 연결을 자식이 함께 쓰지 않도록 새 클라이언트
+        super()._reset()
+        self._client = httpx.Client(timeout=2)
+
+    def export(self, payload: dict) -> None:
+        self._client.post(self.endpoint, json=payload).raise_for_status()
+
+
+def create_exporter() -> Exporter | None:
+    """TRACE_EXPORT 설정에 따른 exporter (비활성이면 None)"""
+    if TRACE_EXPORT == "file":
+        return FileExporter(TRACE_FILE)
+    if TRACE_EXPORT == "otlp":
+        return OTLPHttpExporter(TRACE_OTLP_ENDPOINT)
+    return None
+
+
+def traced(endpoint):
+    """핸들러 실행 구간을 span으로 기록하고 직렬화 시작 시점을 남김"""
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            with span("handler", function=endpoint.__name__):
+                result = await endpoint(*args, **kwargs)
+            trace = current_trace.get()
+            if trace is not None:
+                trace.handler_end_ns = time.time_ns()
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        with span("handler", function=endpoint.__name__):
+            result = endpoint(*args, **kwargs)
+        trace = current_trace.get()
+        if trace is not None:
+            trace.handler_end_ns = time.time_ns()
+        return result
+
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    """엔드포인트를 traced()로 감싸는 라우트 클래스"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, traced(endpoint), **kwargs)
+
+
+class TracingMiddleware:
+    """요청마다 루트 span을 만들고, 끝나면 trace를 exporter로 넘김"""
+
+    def __init__(
+        self,
+        app,
+        exporter: Exporter | None = None,
+        sample_rate: float = TRACE_SAMPLE_RATE,
+    ):
+        self.app = app
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or self.exporter is None
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        root = Span(
+            f"{scope['method']} {scope['path']}",
+            trace.trace_id,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        trace_token = current_trace.set(trace)
+        span_token = current_span.set(root)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                # 핸들러 반환 후 응답 시작까지 = 응답 검증/직렬화
+                if trace.handler_end_ns is not None:
+                    serialize = Span(
+                        "serialize",
+                        trace.trace_id,
+                        root.span_id,
+                        start_ns=trace.handler_end_ns,
+                    )
+                    serialize.end()
+                    trace.add(serialize)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_span.reset(span_token)
+            current_trace.reset(trace_token)
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{scope['method']} {route.path}"
+                root.attributes["http.route"] = route.path
+            root.end()
+            trace.add(root)
+            self.exporter.submit(trace)